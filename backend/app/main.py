@@ -151,11 +151,11 @@ async def websocket_interview_endpoint(
                 logger.warning(f"[WS] Unknown message type: {message_type}")
     
     except WebSocketDisconnect:
-        manager.disconnect(interview_id, db=db)
+        await manager.disconnect(interview_id, db=db)
         logger.info(f"WebSocket disconnected for interview {interview_id}")
     except Exception as e:
         logger.error(f"[WS] WebSocket error: {e}", exc_info=True)
-        manager.disconnect(interview_id, db=db)
+        await manager.disconnect(interview_id, db=db)
 
 if __name__ == "__main__":
     import uvicorn
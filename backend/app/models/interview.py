@@ -1,9 +1,34 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, Enum, LargeBinary
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 import enum
+import orjson
 from ..core.database import Base
 
+class OrjsonBinary(TypeDecorator):
+    """
+    JSON document stored as orjson-encoded bytes in a BLOB column.
+    Dicts (numpy values included) are encoded on write, pre-encoded bytes are
+    passed through as-is, and values are decoded back to dicts on read.
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, (bytes, bytearray)):
+            return value
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    
+    def process_result_value(self, value, dialect):
+        return load_json_blob(value)
+
+def load_json_blob(value):
+    """Decode an orjson BLOB value (also accepts legacy JSON text or an already-decoded dict)"""
+    if value is None or isinstance(value, (dict, list)):
+        return value
+    return orjson.loads(value)
+
 class InterviewStatus(str, enum.Enum):
     SCHEDULED = "scheduled"
     IN_PROGRESS = "in_progress"
@@ -132,7 +157,7 @@ class EmotionLog(Base):
     speech_emotion = Column(String(50), nullable=True)
     speech_confidence = Column(Float, nullable=True)
     
-    emotion_scores = Column(JSON, nullable=True)
+    emotion_scores = Column(OrjsonBinary, nullable=True)  # orjson bytes, see OrjsonBinary
     
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -3,6 +3,8 @@ Audio Recording Service for Interview Sessions
 Records continuous audio stream to WAV file
 """
 import wave
+import queue
+import threading
 import numpy as np
 import os
 from pathlib import Path
@@ -11,6 +13,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Chunks are handed to a writer thread and written in batches of about this size
+WRITE_BATCH_BYTES = 64 * 1024
+_STOP = object()
+
 class AudioRecorder:
     def __init__(self, interview_id: int, sample_rate: int = 16000, channels: int = 1):
         self.interview_id = interview_id
@@ -20,6 +26,8 @@ class AudioRecorder:
         self.wav_file = None
         self.audio_buffer = []
         self.is_recording = False
+        self._write_queue = queue.SimpleQueue()
+        self._writer_thread = None
         
         # Create recordings directory if not exists
         self.recordings_dir = Path("./storage/recordings")
@@ -41,6 +49,12 @@ class AudioRecorder:
             self.wav_file.setframerate(self.sample_rate)
             self.is_recording = True
             
+            # File I/O happens off the event loop
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name=f"audio-writer-{self.interview_id}", daemon=True
+            )
+            self._writer_thread.start()
+            
             logger.info(f"[AudioRecorder] Recording started: {self.file_path}")
             return True
         except Exception as e:
@@ -55,23 +69,54 @@ class AudioRecorder:
         try:
             # Convert float32 [-1, 1] to int16 [-32768, 32767]
             if audio_data.dtype == np.float32:
-                audio_int16 = (audio_data * 32767).astype(np.int16)
+                audio_int16 = np.multiply(audio_data, 32767, dtype=np.float32).astype(np.int16)
+            elif audio_data.dtype == np.int16:
+                audio_int16 = audio_data  # Already PCM16, no conversion needed
             else:
                 audio_int16 = audio_data.astype(np.int16)
             
-            # Write to file
-            self.wav_file.writeframes(audio_int16.tobytes())
+            # Queue for the writer thread (copied, caller may reuse its buffer)
+            self._write_queue.put(audio_int16.tobytes())
             return True
         except Exception as e:
             logger.error(f"[AudioRecorder] Error writing chunk: {e}")
             return False
     
+    def _writer_loop(self):
+        """Drain queued chunks and write them in WRITE_BATCH_BYTES batches until stopped"""
+        batch = bytearray()
+        stopping = False
+        while not stopping:
+            item = self._write_queue.get()
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch += item
+                if len(batch) >= WRITE_BATCH_BYTES:
+                    break
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.wav_file.writeframes(batch)
+                except Exception as e:
+                    logger.error(f"[AudioRecorder] Error writing chunk: {e}")
+                batch = bytearray()
+    
     def stop_recording(self):
         """Stop recording and close file"""
         if self.wav_file:
             try:
-                self.wav_file.close()
                 self.is_recording = False
+                # Flush everything still queued before the header is finalized
+                if self._writer_thread is not None:
+                    self._write_queue.put(_STOP)
+                    self._writer_thread.join()
+                    self._writer_thread = None
+                self.wav_file.close()
                 
                 # Verify file was created
                 if self.file_path.exists():
@@ -8,6 +8,7 @@ Processes recorded audio after interview completes:
 """
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -43,6 +44,8 @@ class BatchProcessor:
         self.whisper_model = None
         self.semantic_model = None
         self.nlp_analyzer = None
+        # Audio files are deleted off the request path (unlink can stall on metadata journaling)
+        self._cleanup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="audio-cleanup")
         if WHISPER_AVAILABLE:
             self._initialize_whisper()
         if SENTENCE_TRANSFORMER_AVAILABLE:
@@ -56,7 +59,7 @@ class BatchProcessor:
             self.nlp_analyzer = NLPAnalyzer()
             logger.info("NLP analyzer initialized for sentiment analysis")
         except Exception as e:
-            logger.error(f"Failed to initialize NLP analyzer: {e}")
+            logger.error("Failed to initialize NLP analyzer: %s", e)
             self.nlp_analyzer = None
     
     def _initialize_whisper(self):
@@ -66,7 +69,7 @@ class BatchProcessor:
             device = "cuda" if torch.cuda.is_available() else "cpu"
             compute_type = "float16" if device == "cuda" else "int8"
             
-            logger.info(f"Initializing Whisper large model on {device}")
+            logger.info("Initializing Whisper large model on %s", device)
             self.whisper_model = WhisperModel(
                 "large-v2",
                 device=device,
@@ -75,7 +78,7 @@ class BatchProcessor:
             )
             logger.info("Whisper model initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Whisper: {e}")
+            logger.error("Failed to initialize Whisper: %s", e)
             self.whisper_model = None
     
     def _initialize_semantic_model(self):
@@ -86,7 +89,7 @@ class BatchProcessor:
             self.semantic_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
             logger.info("Sentence transformer loaded successfully")
         except Exception as e:
-            logger.error(f"Failed to load sentence transformer: {e}")
+            logger.error("Failed to load sentence transformer: %s", e)
             self.semantic_model = None
     
     def transcribe_audio(self, audio_file_path: str, language: str = "id") -> Tuple[str, float, List[Dict]]:
@@ -111,18 +114,18 @@ class BatchProcessor:
             return "Ini adalah transkrip percobaan untuk testing. Kandidat menunjukkan kemampuan komunikasi yang baik, dapat menjelaskan dengan jelas, dan menunjukkan kemampuan problem solving.", 0.8, mock_segments
         
         if not Path(audio_file_path).exists():
-            logger.error(f"Audio file not found: {audio_file_path}")
+            logger.error("Audio file not found: %s", audio_file_path)
             # Try with absolute path
             abs_path = Path(__file__).parent.parent.parent / audio_file_path
             if abs_path.exists():
                 audio_file_path = str(abs_path)
-                logger.info(f"Found audio at: {audio_file_path}")
+                logger.info("Found audio at: %s", audio_file_path)
             else:
-                logger.error(f"Audio file not found even with absolute path")
+                logger.error("Audio file not found even with absolute path")
                 return "", 0.0
         
         try:
-            logger.info(f"Starting transcription: {audio_file_path}")
+            logger.info("Starting transcription: %s", audio_file_path)
             
             # Transcribe with Whisper (beam_size=5 for better accuracy)
             segments, info = self.whisper_model.transcribe(
@@ -160,13 +163,13 @@ class BatchProcessor:
             # Convert log probability to 0-1 confidence
             confidence = min(1.0, max(0.0, (avg_confidence + 1.0)))
             
-            logger.info(f"Transcription complete: {len(transcript)} chars, {segment_count} segments")
-            logger.info(f"Language detected: {info.language} (probability: {info.language_probability:.2f})")
+            logger.info("Transcription complete: %d chars, %d segments", len(transcript), segment_count)
+            logger.info("Language detected: %s (probability: %.2f)", info.language, info.language_probability)
             
             return transcript, confidence, segments_list
             
         except Exception as e:
-            logger.error(f"Error transcribing audio: {e}", exc_info=True)
+            logger.error("Error transcribing audio: %s", e, exc_info=True)
             return "", 0.0, []
     
     def analyze_with_indicators(
@@ -204,7 +207,7 @@ class BatchProcessor:
                     'reasoning': assessment['reasoning']
                 })
             except Exception as e:
-                logger.error(f"Error assessing indicator {indicator['name']}: {e}")
+                logger.error("Error assessing indicator %s: %s", indicator['name'], e)
                 results.append({
                     'indicator_id': indicator['id'],
                     'indicator_name': indicator['name'],
@@ -272,12 +275,12 @@ class BatchProcessor:
                 if len(keyword) >= 3 and keyword in sent_lower:
                     # Found exact mention!
                     exact_matches.append(sent)
-                    logger.info(f"[Exact Match] Found '{keyword}' in: {sent[:80]}...")
+                    logger.info("[Exact Match] Found '%s' in: %.80s...", keyword, sent)
                     break
         
         # If we have exact matches, prioritize them heavily
         if exact_matches:
-            logger.info(f"[Exact Match] {len(exact_matches)} sentences contain exact keyword '{indicator_name}'")
+            logger.info("[Exact Match] %d sentences contain exact keyword '%s'", len(exact_matches), indicator_name)
         
         if not sentences:
             return {
@@ -316,7 +319,9 @@ class BatchProcessor:
         
         sentences = filtered_sentences
         
-        logger.info(f"[Semantic] After filtering: {len(sentences)} sentences (removed {len([s for s in sentences if s not in filtered_sentences])} pure intro sentences)")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[Semantic] After filtering: %d sentences (removed %d pure intro sentences)",
+                        len(sentences), len([s for s in sentences if s not in filtered_sentences]))
         
         # Create comprehensive indicator query with Indonesian variations
         # This helps the semantic model better understand what we're looking for
@@ -347,8 +352,8 @@ class BatchProcessor:
         # Just describe what we're looking for, let semantic model match the concept
         indicator_query = ". ".join(query_parts) + ". Perilaku, tindakan, atau pengalaman yang menunjukkan karakteristik ini."
         
-        logger.info(f"[Semantic] Query: {indicator_query[:120]}...")
-        logger.info(f"[Semantic] Exact matches found: {len(exact_matches)}")
+        logger.info("[Semantic] Query: %.120s...", indicator_query)
+        logger.info("[Semantic] Exact matches found: %d", len(exact_matches))
         
         # Encode indicator and sentences
         try:
@@ -390,13 +395,14 @@ class BatchProcessor:
             relevant_sentences = hybrid_matches
             
             # Log for debugging - show top 5 similarities
-            logger.info(f"[Semantic] Indicator: {indicator_name}")
-            logger.info(f"[Semantic] Total sentences: {len(sentences)}, Exact: {len(exact_matches)}, Semantic (>{SIMILARITY_THRESHOLD}): {len(relevant_sentences) - len(exact_matches)}")
-            if similarities:
+            logger.info("[Semantic] Indicator: %s", indicator_name)
+            logger.info("[Semantic] Total sentences: %d, Exact: %d, Semantic (>%s): %d",
+                        len(sentences), len(exact_matches), SIMILARITY_THRESHOLD, len(relevant_sentences) - len(exact_matches))
+            if similarities and logger.isEnabledFor(logging.INFO):
                 top_5 = similarities[:min(5, len(similarities))]
-                logger.info(f"[Semantic] Top 5 semantic similarities: {[(f'{sim:.3f}', sent[:60] + '...') for sim, sent in top_5]}")
+                logger.info("[Semantic] Top 5 semantic similarities: %s", [(f'{sim:.3f}', sent[:60] + '...') for sim, sent in top_5])
             if relevant_sentences:
-                logger.info(f"[Semantic] Best overall match: {relevant_sentences[0][0]:.3f} - '{relevant_sentences[0][1][:80]}...'")
+                logger.info("[Semantic] Best overall match: %.3f - '%.80s...'", relevant_sentences[0][0], relevant_sentences[0][1])
             
             # Calculate score based on relevance
             if not relevant_sentences:
@@ -436,7 +442,7 @@ class BatchProcessor:
                 if len(exact_matches) > 0:
                     exact_match_bonus = min(15, len(exact_matches) * 8)  # Up to +15 for exact matches
                     score = min(100, score + exact_match_bonus)
-                    logger.info(f"[Scoring] Exact match bonus: +{exact_match_bonus} points")
+                    logger.info("[Scoring] Exact match bonus: +%d points", exact_match_bonus)
                 
                 # Reasoning based on score and relevance
                 exact_match_note = f" Termasuk {len(exact_matches)} penyebutan langsung." if len(exact_matches) > 0 else ""
@@ -473,7 +479,7 @@ class BatchProcessor:
             }
             
         except Exception as e:
-            logger.error(f"Error in semantic similarity: {e}")
+            logger.error("Error in semantic similarity: %s", e)
             # Fallback to keyword matching
             return self._assess_with_keywords(transcript, indicator_name, indicator_description)
     
@@ -551,7 +557,7 @@ class BatchProcessor:
         
         # If we get very few sentences (no punctuation), use alternative strategies
         if len(sentences) <= 2:
-            logger.info(f"[Sentence Split] Few sentences from punctuation ({len(sentences)}), using clause splitting")
+            logger.info("[Sentence Split] Few sentences from punctuation (%d), using clause splitting", len(sentences))
             
             # Strategy 2: Split by Indonesian conjunctions and clause markers
             # These often indicate sentence/clause boundaries
@@ -611,7 +617,7 @@ class BatchProcessor:
         # Clean and filter
         sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 15]
         
-        logger.info(f"[Sentence Split] Result: {len(sentences)} sentences from {len(text)} chars")
+        logger.info("[Sentence Split] Result: %d sentences from %d chars", len(sentences), len(text))
         
         return sentences
     
@@ -625,26 +631,32 @@ class BatchProcessor:
             db: Database session
         """
         if not segments_list:
-            logger.warning(f"[Interview {interview_id}] No segments to save")
+            logger.warning("[Interview %d] No segments to save", interview_id)
             return
         
         try:
             from ..models.interview import TranscriptEntry
             
-            saved_count = 0
+            segments = []
             for segment in segments_list:
                 text = segment.get('text', '').strip()
                 if not text or len(text) < 3:
                     continue
-                
-                # Analyze sentiment for this segment
-                sentiment_result = {'score': 0.5, 'label': 'neutral', 'confidence': 0.0}
-                if self.nlp_analyzer:
-                    try:
-                        sentiment_result = self.nlp_analyzer.analyze_sentiment(text)
-                    except Exception as e:
-                        logger.error(f"Error analyzing sentiment for segment: {e}")
-                
+                segments.append((segment, text))
+            
+            # Analyze sentiment for all segments in one batched encode
+            neutral = {'score': 0.5, 'label': 'neutral', 'confidence': 0.0}
+            sentiment_results = [neutral] * len(segments)
+            if self.nlp_analyzer and segments:
+                try:
+                    sentiment_results = self.nlp_analyzer.analyze_sentiment_batch(
+                        [text for _, text in segments]
+                    )
+                except Exception as e:
+                    logger.error("Error analyzing sentiment for segments: %s", e)
+            
+            saved_count = 0
+            for (segment, text), sentiment_result in zip(segments, sentiment_results):
                 # Create transcript entry
                 # Assume "Candidate" as speaker (since we don't have speaker diarization)
                 # In future, could add speaker diarization
@@ -662,10 +674,10 @@ class BatchProcessor:
                 saved_count += 1
             
             db.commit()
-            logger.info(f"[Interview {interview_id}] Saved {saved_count} transcript entries with sentiment analysis")
+            logger.info("[Interview %d] Saved %d transcript entries with sentiment analysis", interview_id, saved_count)
             
         except Exception as e:
-            logger.error(f"[Interview {interview_id}] Error saving transcript entries: {e}")
+            logger.error("[Interview %d] Error saving transcript entries: %s", interview_id, e)
             db.rollback()
     
     def calculate_overall_score(self, assessments: List[Dict], indicators: List[Dict]) -> float:
@@ -710,11 +722,11 @@ class BatchProcessor:
             audio_path = Path(audio_file_path)
             if audio_path.exists():
                 audio_path.unlink()
-                logger.info(f"[Interview {interview_id}] Audio file cleaned up: {audio_file_path}")
+                logger.info("[Interview %d] Audio file cleaned up: %s", interview_id, audio_file_path)
             else:
-                logger.warning(f"[Interview {interview_id}] Audio file not found for cleanup: {audio_file_path}")
+                logger.warning("[Interview %d] Audio file not found for cleanup: %s", interview_id, audio_file_path)
         except Exception as e:
-            logger.error(f"[Interview {interview_id}] Error cleaning up audio file: {e}")
+            logger.error("[Interview %d] Error cleaning up audio file: %s", interview_id, e)
             # Don't raise - cleanup failure shouldn't break the process
     
     def process_interview(
@@ -736,12 +748,14 @@ class BatchProcessor:
         Returns:
             Dict with processing results
         """
+        from ..models.interview import Interview
+        interview = None
+        
         try:
-            logger.info(f"Starting batch processing for interview {interview_id}")
+            logger.info("Starting batch processing for interview %d", interview_id)
             
             # Update status to processing
-            from ..models.interview import Interview
-            interview = db.query(Interview).filter(Interview.id == interview_id).first()
+            interview = db.get(Interview, interview_id)
             if not interview:
                 raise ValueError(f"Interview {interview_id} not found")
             
@@ -755,13 +769,13 @@ class BatchProcessor:
             ).all()
             
             if existing_assessments:
-                logger.info(f"[Interview {interview_id}] Deleting {len(existing_assessments)} old assessments for reprocessing...")
+                logger.info("[Interview %d] Deleting %d old assessments for reprocessing...", interview_id, len(existing_assessments))
                 for old_assessment in existing_assessments:
                     db.delete(old_assessment)
                 db.commit()
             
             # Step 1: Transcribe audio
-            logger.info(f"[Interview {interview_id}] Transcribing audio...")
+            logger.info("[Interview %d] Transcribing audio...", interview_id)
             transcript, confidence, segments_list = self.transcribe_audio(audio_file_path)
             
             if not transcript:
@@ -770,14 +784,14 @@ class BatchProcessor:
             # Save full transcript
             interview.transcript = transcript
             db.commit()
-            logger.info(f"[Interview {interview_id}] Transcript saved ({len(transcript)} chars)")
+            logger.info("[Interview %d] Transcript saved (%d chars)", interview_id, len(transcript))
             
             # Step 1.5: Create transcript entries with sentiment analysis
-            logger.info(f"[Interview {interview_id}] Creating transcript entries with sentiment analysis...")
+            logger.info("[Interview %d] Creating transcript entries with sentiment analysis...", interview_id)
             self._save_transcript_entries(interview_id, segments_list, db)
             
             # Step 2: Analyze with indicators
-            logger.info(f"[Interview {interview_id}] Analyzing with {len(indicators)} indicators...")
+            logger.info("[Interview %d] Analyzing with %d indicators...", interview_id, len(indicators))
             assessments = self.analyze_with_indicators(transcript, indicators)
             
             # Step 3: Calculate overall score
@@ -796,9 +810,7 @@ class BatchProcessor:
             
             # Step 5: Update InterviewScore with overall AI score and final score
             from ..models.interview import InterviewScore
-            score_record = db.query(InterviewScore).filter(
-                InterviewScore.interview_id == interview_id
-            ).first()
+            score_record = interview.scores
             
             if not score_record:
                 # Create new score record if doesn't exist
@@ -821,10 +833,11 @@ class BatchProcessor:
             interview.processed_at = datetime.utcnow()
             db.commit()
             
-            logger.info(f"[Interview {interview_id}] Processing complete! Overall AI score: {overall_score:.2f}, Final score: {score_record.final_score}")
+            logger.info("[Interview %d] Processing complete! Overall AI score: %.2f, Final score: %s",
+                        interview_id, overall_score, score_record.final_score)
             
             # Cleanup audio file after successful processing to save disk space
-            self._cleanup_audio_file(audio_file_path, interview_id)
+            self._cleanup_pool.submit(self._cleanup_audio_file, audio_file_path, interview_id)
             
             return {
                 'success': True,
@@ -837,11 +850,11 @@ class BatchProcessor:
             }
             
         except Exception as e:
-            logger.error(f"[Interview {interview_id}] Processing failed: {e}", exc_info=True)
+            logger.error("[Interview %d] Processing failed: %s", interview_id, e, exc_info=True)
             
-            # Update status to failed
+            # Update status to failed (reuse the row loaded above, no re-query)
             try:
-                interview = db.query(Interview).filter(Interview.id == interview_id).first()
+                db.rollback()
                 if interview:
                     interview.processing_status = "failed"
                     db.commit()
@@ -857,6 +870,7 @@ class BatchProcessor:
     
     def cleanup(self):
         """Cleanup resources"""
+        self._cleanup_pool.shutdown(wait=True)
         if self.whisper_model:
             del self.whisper_model
             self.whisper_model = None
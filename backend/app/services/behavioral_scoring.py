@@ -1,9 +1,13 @@
-from typing import Dict, List
-import numpy as np
+from typing import Dict, List, Optional
 import logging
+import bisect
 
 logger = logging.getLogger(__name__)
 
+# Lower bounds of each rating band (score >= threshold moves up one band)
+RATING_THRESHOLDS = [1.5, 2.5, 3.5, 4.5]
+RATING_LABELS = ("Sangat Kurang", "Kurang", "Cukup", "Baik", "Sangat Baik")
+
 class BehavioralScoringEngine:
     def __init__(self):
         self.berakhlak_dimensions = [
@@ -15,6 +19,10 @@ class BehavioralScoringEngine:
             "adaptif",
             "kolaboratif"
         ]
+        self.dimension_labels = {
+            dimension: dimension.replace("_", " ").title()
+            for dimension in self.berakhlak_dimensions
+        }
     
     def calculate_dimension_scores(
         self,
@@ -45,7 +53,8 @@ class BehavioralScoringEngine:
         speech_clarity: float,
         coherence: float
     ) -> Dict[str, float]:
-        avg_dimension = np.mean(list(dimension_scores.values()))
+        values = dimension_scores.values()
+        avg_dimension = sum(values) / len(values) if values else 0.0
         
         behavioral_score = (
             emotion_stability * 0.25 +
@@ -67,17 +76,26 @@ class BehavioralScoringEngine:
         ai_scores: Dict[str, float],
         manual_scores: Dict[str, float]
     ) -> float:
-        ai_avg = np.mean([v for v in ai_scores.values() if v is not None])
+        ai_avg = self._mean_ignoring_none(ai_scores.values())
+        if ai_avg is None:
+            ai_avg = 0.0
         
-        manual_values = [v for v in manual_scores.values() if v is not None]
-        if manual_values:
-            manual_avg = np.mean(manual_values)
+        manual_avg = self._mean_ignoring_none(manual_scores.values())
+        if manual_avg is not None:
             final = (ai_avg * 0.6 + manual_avg * 0.4)
         else:
             final = ai_avg
         
         return round(final, 2)
     
+    def _mean_ignoring_none(self, values) -> Optional[float]:
+        total, count = 0.0, 0
+        for value in values:
+            if value is not None:
+                total += value
+                count += 1
+        return total / count if count else None
+    
     def generate_recommendation(self, final_score: float) -> str:
         if final_score >= 4.0:
             return "layak"
@@ -94,49 +112,47 @@ class BehavioralScoringEngine:
         coherence: float,
         dominant_emotions: List[str]
     ) -> str:
-        summary_parts = []
-        
-        summary_parts.append("RINGKASAN ANALISIS PERILAKU")
-        summary_parts.append("=" * 50)
-        
-        summary_parts.append("\n1. NILAI BerAKHLAK:")
-        for dimension, score in dimension_scores.items():
-            label = dimension.replace("_", " ").title()
-            rating = self._get_rating(score)
-            summary_parts.append(f"   - {label}: {score}/5.0 ({rating})")
+        dimension_lines = "\n".join(
+            f"   - {self._get_dimension_label(dimension)}: {score}/5.0 ({self._get_rating(score)})"
+            for dimension, score in dimension_scores.items()
+        )
         
-        summary_parts.append("\n2. INDIKATOR PERILAKU:")
-        summary_parts.append(f"   - Stabilitas Emosi: {emotion_stability*5:.2f}/5.0 ({self._get_rating(emotion_stability*5)})")
-        summary_parts.append(f"   - Kejelasan Komunikasi: {speech_clarity*5:.2f}/5.0 ({self._get_rating(speech_clarity*5)})")
-        summary_parts.append(f"   - Koherensi Jawaban: {coherence*5:.2f}/5.0 ({self._get_rating(coherence*5)})")
-        
-        summary_parts.append("\n3. ANALISIS EMOSI:")
         emotion_counts = {}
         for emotion in dominant_emotions:
             emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
         
+        emotion_lines = ""
         if emotion_counts:
             most_common = max(emotion_counts, key=emotion_counts.get)
-            summary_parts.append(f"   - Emosi dominan: {most_common}")
-            summary_parts.append(f"   - Variasi emosi: {len(emotion_counts)} jenis emosi terdeteksi")
+            emotion_lines = (
+                f"\n   - Emosi dominan: {most_common}"
+                f"\n   - Variasi emosi: {len(emotion_counts)} jenis emosi terdeteksi"
+            )
         
         highest_dimension = max(dimension_scores, key=dimension_scores.get)
         lowest_dimension = min(dimension_scores, key=dimension_scores.get)
         
-        summary_parts.append("\n4. KESIMPULAN:")
-        summary_parts.append(f"   - Kekuatan: {highest_dimension.replace('_', ' ').title()} ({dimension_scores[highest_dimension]}/5.0)")
-        summary_parts.append(f"   - Area Pengembangan: {lowest_dimension.replace('_', ' ').title()} ({dimension_scores[lowest_dimension]}/5.0)")
-        
-        return "\n".join(summary_parts)
+        return (
+            "RINGKASAN ANALISIS PERILAKU\n"
+            f"{'=' * 50}\n"
+            "\n1. NILAI BerAKHLAK:\n"
+            f"{dimension_lines}\n"
+            "\n2. INDIKATOR PERILAKU:\n"
+            f"   - Stabilitas Emosi: {emotion_stability*5:.2f}/5.0 ({self._get_rating(emotion_stability*5)})\n"
+            f"   - Kejelasan Komunikasi: {speech_clarity*5:.2f}/5.0 ({self._get_rating(speech_clarity*5)})\n"
+            f"   - Koherensi Jawaban: {coherence*5:.2f}/5.0 ({self._get_rating(coherence*5)})\n"
+            "\n3. ANALISIS EMOSI:"
+            f"{emotion_lines}\n"
+            "\n4. KESIMPULAN:\n"
+            f"   - Kekuatan: {self._get_dimension_label(highest_dimension)} ({dimension_scores[highest_dimension]}/5.0)\n"
+            f"   - Area Pengembangan: {self._get_dimension_label(lowest_dimension)} ({dimension_scores[lowest_dimension]}/5.0)"
+        )
+    
+    def _get_dimension_label(self, dimension: str) -> str:
+        label = self.dimension_labels.get(dimension)
+        if label is None:
+            label = self.dimension_labels[dimension] = dimension.replace("_", " ").title()
+        return label
     
     def _get_rating(self, score: float) -> str:
-        if score >= 4.5:
-            return "Sangat Baik"
-        elif score >= 3.5:
-            return "Baik"
-        elif score >= 2.5:
-            return "Cukup"
-        elif score >= 1.5:
-            return "Kurang"
-        else:
-            return "Sangat Kurang"
+        return RATING_LABELS[bisect.bisect_right(RATING_THRESHOLDS, score)]
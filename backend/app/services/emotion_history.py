@@ -0,0 +1,82 @@
+"""
+Fixed-size history of facial emotion labels for the stability score.
+Labels are stored as int8 codes in a preallocated ring so the per-frame
+stability update is a compiled loop instead of a Python walk over strings.
+"""
+import numpy as np
+
+# Optional: Numba JIT for the label-change count
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+EMOTION_LABELS = ('angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral')
+_LABEL_CODES = {label: code for code, label in enumerate(EMOTION_LABELS)}
+_UNKNOWN_CODE = -1
+
+
+@njit(cache=True)
+def _count_label_changes(codes, start, length):
+    """Number of adjacent label changes in the ring, walked in chronological order"""
+    size = codes.shape[0]
+    changes = 0
+    prev = codes[start % size]
+    for i in range(1, length):
+        cur = codes[(start + i) % size]
+        if cur != prev:
+            changes += 1
+        prev = cur
+    return changes
+
+
+def stability_from_changes(changes: int, length: int) -> float:
+    """1 - change rate, clamped to [0, 1]; fewer than 2 labels counts as fully stable"""
+    if length < 2:
+        return 1.0
+    return max(0.0, min(1.0, 1.0 - changes / length))
+
+
+class EmotionHistory:
+    """Ring buffer of the last `maxlen` dominant-emotion labels"""
+
+    def __init__(self, maxlen: int = 100):
+        self.codes = np.zeros(maxlen, dtype=np.int8)
+        self.start = 0
+        self.length = 0
+
+    def append(self, label: str):
+        size = self.codes.shape[0]
+        code = _LABEL_CODES.get(label, _UNKNOWN_CODE)
+        if self.length < size:
+            self.codes[(self.start + self.length) % size] = code
+            self.length += 1
+        else:
+            # Full: overwrite the oldest label and advance the start
+            self.codes[self.start] = code
+            self.start = (self.start + 1) % size
+
+    def __len__(self) -> int:
+        return self.length
+
+    def stability(self) -> float:
+        if self.length < 2:
+            return 1.0
+        return stability_from_changes(_count_label_changes(self.codes, self.start, self.length), self.length)
+
+
+def calculate_stability(emotion_history) -> float:
+    """Stability for an EmotionHistory ring or a plain sequence of labels"""
+    if isinstance(emotion_history, EmotionHistory):
+        return emotion_history.stability()
+    if not emotion_history or len(emotion_history) < 2:
+        return 1.0
+    codes = np.fromiter((_LABEL_CODES.get(label, _UNKNOWN_CODE) for label in emotion_history),
+                        dtype=np.int8, count=len(emotion_history))
+    return stability_from_changes(_count_label_changes(codes, 0, len(codes)), len(codes))
@@ -2,20 +2,137 @@ import cv2
 import numpy as np
 from deepface import DeepFace
 from typing import Dict, Optional, Tuple
+from pathlib import Path
+import importlib.util
+import threading
 import logging
 
+from ..core.config import settings
+from .emotion_history import EMOTION_LABELS, calculate_stability
+
 logger = logging.getLogger(__name__)
 
+# YuNet ONNX model (opencv_zoo). Falls back to the Haar cascade bundled with OpenCV if absent.
+YUNET_MODEL_FILE = "face_detection_yunet_2023mar.onnx"
+# Face crops are resized into a reused buffer of this size before the emotion model
+FACE_INPUT_SIZE = 224
+
+# INT8 ONNX export of DeepFace's emotion CNN; used instead of DeepFace.analyze when present
+ONNX_EMOTION_MODEL_FILE = "facial_emotion_int8.onnx"
+ONNX_EMOTION_INPUT_SIZE = 48
+
+class OnnxEmotionModel:
+    """
+    ONNX Runtime (int8, CUDA when onnxruntime-gpu is installed, else CPU) runner for the
+    DeepFace emotion CNN: 48x48 grayscale in, 7-way softmax out in EMOTION_LABELS order.
+    
+    Export once offline:
+        python -m tf2onnx.convert --keras facial_expression_model.h5 --output facial_emotion.onnx
+        python -m onnxruntime.quantization.preprocess --input facial_emotion.onnx --output facial_emotion.prep.onnx
+        python -c "from onnxruntime.quantization import quantize_dynamic; quantize_dynamic('facial_emotion.prep.onnx', 'facial_emotion_int8.onnx')"
+    """
+    
+    _instance = None
+    _lock = threading.Lock()
+    
+    def __init__(self, model_path: Path):
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        # One thread per run; concurrency comes from the websocket worker pool across interviews
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # With onnxruntime-gpu the CNN runs on CUDA; the CPU provider stays as the fallback
+        providers = ['CPUExecutionProvider']
+        if 'CUDAExecutionProvider' in ort.get_available_providers():
+            providers.insert(0, ('CUDAExecutionProvider', {'device_id': 0}))
+        self.session = ort.InferenceSession(str(model_path), sess_options=options, providers=providers)
+        self.device = 'cuda' if self.session.get_providers()[0] == 'CUDAExecutionProvider' else 'cpu'
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # NHWC (1, 48, 48, 1) and NCHW (1, 1, 48, 48) share the same memory layout for one channel
+        self.input_shape = (1, 1, ONNX_EMOTION_INPUT_SIZE, ONNX_EMOTION_INPUT_SIZE) \
+            if model_input.shape[1] == 1 else (1, ONNX_EMOTION_INPUT_SIZE, ONNX_EMOTION_INPUT_SIZE, 1)
+    
+    @classmethod
+    def load(cls) -> Optional["OnnxEmotionModel"]:
+        """Shared session (thread-safe for run) if the export and onnxruntime are available, else None"""
+        with cls._lock:
+            if cls._instance is None:
+                model_path = Path(settings.MODELS_DIR) / ONNX_EMOTION_MODEL_FILE
+                if not model_path.exists():
+                    cls._instance = False
+                elif importlib.util.find_spec("onnxruntime") is None:
+                    logger.warning("ONNX emotion model found but onnxruntime is not installed")
+                    cls._instance = False
+                else:
+                    try:
+                        cls._instance = cls(model_path)
+                        logger.info(f"Using INT8 ONNX emotion model on {cls._instance.device}: {model_path}")
+                    except Exception as e:
+                        logger.error(f"Failed to load ONNX emotion model: {e}")
+                        cls._instance = False
+            return cls._instance or None
+    
+    def predict(self, face: np.ndarray, gray_buf: np.ndarray, input_buf: np.ndarray) -> np.ndarray:
+        """Class probabilities for a BGR face crop, using the caller's preallocated buffers"""
+        gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+        cv2.resize(gray, (ONNX_EMOTION_INPUT_SIZE, ONNX_EMOTION_INPUT_SIZE), dst=gray_buf,
+                   interpolation=cv2.INTER_AREA)
+        np.multiply(gray_buf, np.float32(1.0 / 255.0), out=input_buf, casting='unsafe')
+        return self.session.run(None, {self.input_name: input_buf.reshape(self.input_shape)})[0][0]
+
 class FacialEmotionService:
     def __init__(self):
         self.detector = None
-        self.emotion_labels = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+        self.face_detector = None
+        self.emotion_labels = list(EMOTION_LABELS)
+        self._face_buf = np.empty((FACE_INPUT_SIZE, FACE_INPUT_SIZE, 3), dtype=np.uint8)
+        self.onnx_model = None
+        self._gray_buf = np.empty((ONNX_EMOTION_INPUT_SIZE, ONNX_EMOTION_INPUT_SIZE), dtype=np.uint8)
+        self._input_buf = np.empty((ONNX_EMOTION_INPUT_SIZE, ONNX_EMOTION_INPUT_SIZE), dtype=np.float32)
     
     def initialize(self):
         if self.detector is None:
-            logger.info("Loading DeepFace emotion detector")
+            self.face_detector = self._load_face_detector()
+            self.onnx_model = OnnxEmotionModel.load()
+            if self.onnx_model is None:
+                logger.info("Loading DeepFace emotion detector")
+                DeepFace.build_model('Emotion')
+                logger.info("DeepFace emotion detector loaded successfully")
             self.detector = True
-            logger.info("DeepFace emotion detector loaded successfully")
+    
+    def _load_face_detector(self):
+        yunet_path = Path(settings.MODELS_DIR) / YUNET_MODEL_FILE
+        if yunet_path.exists() and hasattr(cv2, 'FaceDetectorYN'):
+            logger.info(f"Using YuNet face detector: {yunet_path}")
+            return cv2.FaceDetectorYN.create(str(yunet_path), "", (320, 320))
+        
+        logger.info("YuNet model not found, using OpenCV Haar cascade face detector")
+        return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    
+    def _crop_face(self, frame: np.ndarray) -> np.ndarray:
+        """Crop the largest detected face (resized to FACE_INPUT_SIZE); returns the full frame if none is found"""
+        if isinstance(self.face_detector, cv2.CascadeClassifier):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = self.face_detector.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
+        else:
+            height, width = frame.shape[:2]
+            self.face_detector.setInputSize((width, height))
+            _, faces = self.face_detector.detect(frame)
+        
+        if faces is None or len(faces) == 0:
+            return frame
+        
+        x, y, w, h = (int(v) for v in max(faces, key=lambda f: f[2] * f[3])[:4])
+        x, y = max(x, 0), max(y, 0)
+        crop = frame[y:y + h, x:x + w]
+        if crop.size == 0:
+            return frame
+        # Resize once into the preallocated model input instead of a fresh array per frame
+        return cv2.resize(crop, (FACE_INPUT_SIZE, FACE_INPUT_SIZE), dst=self._face_buf,
+                          interpolation=cv2.INTER_AREA)
     
     def detect_emotion(self, frame: np.ndarray) -> Dict:
         self.initialize()
@@ -24,7 +141,21 @@ class FacialEmotionService:
             return self._empty_result()
         
         try:
-            result = DeepFace.analyze(frame, actions=['emotion'], enforce_detection=False, silent=True)
+            face = self._crop_face(frame)
+            
+            if self.onnx_model is not None:
+                probabilities = self.onnx_model.predict(face, self._gray_buf, self._input_buf)
+                best = int(np.argmax(probabilities))
+                return {
+                    "dominant_emotion": EMOTION_LABELS[best],
+                    "confidence": float(probabilities[best]),
+                    "all_emotions": dict(zip(EMOTION_LABELS, probabilities.tolist())),
+                    "face_detected": True
+                }
+            
+            # Face is already located, so skip DeepFace's own detector backend
+            result = DeepFace.analyze(face, actions=['emotion'], detector_backend='skip',
+                                      enforce_detection=False, silent=True)
             
             if isinstance(result, list):
                 result = result[0]
@@ -51,17 +182,9 @@ class FacialEmotionService:
             return self._empty_result()
         return self.detect_emotion(frame)
     
-    def calculate_emotion_stability(self, emotion_history: list) -> float:
-        if not emotion_history or len(emotion_history) < 2:
-            return 1.0
-        
-        changes = 0
-        for i in range(1, len(emotion_history)):
-            if emotion_history[i] != emotion_history[i-1]:
-                changes += 1
-        
-        stability = 1.0 - (changes / len(emotion_history))
-        return max(0.0, min(1.0, stability))
+    def calculate_emotion_stability(self, emotion_history) -> float:
+        """Accepts an EmotionHistory ring or a list of labels; the change count runs in numba"""
+        return calculate_stability(emotion_history)
     
     def _empty_result(self) -> Dict:
         return {
@@ -71,7 +194,15 @@ class FacialEmotionService:
             "face_detected": False
         }
     
+    def reset(self):
+        """Prepare a pooled instance for another interview; loaded models are kept"""
+        # Emotion history lives in the interview state, so only the detector input size is per-stream
+        if self.face_detector is not None and not isinstance(self.face_detector, cv2.CascadeClassifier):
+            self.face_detector.setInputSize((320, 320))
+    
     def cleanup(self):
         if self.detector is not None:
             self.detector = None
+            self.face_detector = None
+            self.onnx_model = None
             logger.info("DeepFace detector cleaned up")
@@ -1,10 +1,16 @@
 """
 Mock AI services untuk testing tanpa AI dependencies
 """
-import random
 import time
 from typing import Dict, List
 
+import numpy as np
+
+BERAKHLAK_DIMENSIONS = (
+    "berorientasi_pelayanan", "akuntabel", "kompeten", "harmonis",
+    "loyal", "adaptif", "kolaboratif"
+)
+
 class MockSpeechToTextService:
     def __init__(self, **kwargs):
         pass
@@ -25,69 +31,87 @@ class MockSpeechToTextService:
     def transcribe_audio_stream(self, audio_data, sample_rate: int = 16000):
         return "Ini adalah transkrip real-time mock", 0.95
     
+    async def transcribe_audio_stream_async(self, audio_data, sample_rate: int = 16000):
+        return self.transcribe_audio_stream(audio_data, sample_rate)
+    
     def cleanup(self):
         pass
 
 class MockFacialEmotionService:
     def __init__(self):
         self.emotions = ['happy', 'neutral', 'sad', 'angry', 'surprise']
+        self._rng = np.random.default_rng(0)
     
     def initialize(self):
         pass
     
     def detect_emotion(self, frame) -> Dict:
-        emotion = random.choice(self.emotions)
+        emotion = self.emotions[self._rng.integers(len(self.emotions))]
         return {
             "dominant_emotion": emotion,
-            "confidence": random.uniform(0.7, 0.95),
-            "all_emotions": {e: random.uniform(0.1, 0.3) for e in self.emotions},
+            "confidence": float(self._rng.uniform(0.7, 0.95)),
+            "all_emotions": dict(zip(self.emotions, self._rng.uniform(0.1, 0.3, size=len(self.emotions)).tolist())),
             "face_detected": True
         }
     
     def calculate_emotion_stability(self, emotion_history: list) -> float:
         if not emotion_history:
             return 0.8
-        return random.uniform(0.7, 0.95)
+        return float(self._rng.uniform(0.7, 0.95))
+    
+    def reset(self):
+        pass
     
     def cleanup(self):
         pass
 
 class MockSpeechEmotionService:
+    def __init__(self):
+        self.emotions = ['calm', 'happy', 'neutral', 'sad', 'angry']
+        self._rng = np.random.default_rng(0)
+    
     def predict_emotion(self, audio_path: str) -> Dict:
-        emotions = ['calm', 'happy', 'neutral', 'sad', 'angry']
         return {
-            "emotion": random.choice(emotions),
-            "confidence": random.uniform(0.7, 0.9),
-            "energy_level": random.uniform(0.3, 0.7),
-            "pitch_variation": random.uniform(0.2, 0.5)
+            "emotion": self.emotions[self._rng.integers(len(self.emotions))],
+            "confidence": float(self._rng.uniform(0.7, 0.9)),
+            "energy_level": float(self._rng.uniform(0.3, 0.7)),
+            "pitch_variation": float(self._rng.uniform(0.2, 0.5))
         }
     
     def analyze_speech_clarity(self, audio_path: str) -> float:
-        return random.uniform(0.7, 0.95)
+        return float(self._rng.uniform(0.7, 0.95))
 
 class MockNLPAnalyzer:
     def __init__(self):
-        pass
+        self._rng = np.random.default_rng(0)
     
     def initialize(self):
         pass
     
     def analyze_berakhlak_values(self, text: str) -> Dict[str, float]:
-        return {
-            "berorientasi_pelayanan": random.uniform(0.5, 0.9),
-            "akuntabel": random.uniform(0.5, 0.9),
-            "kompeten": random.uniform(0.5, 0.9),
-            "harmonis": random.uniform(0.5, 0.9),
-            "loyal": random.uniform(0.5, 0.9),
-            "adaptif": random.uniform(0.5, 0.9),
-            "kolaboratif": random.uniform(0.5, 0.9)
-        }
+        values = self._rng.uniform(0.5, 0.9, size=len(BERAKHLAK_DIMENSIONS)).tolist()
+        return dict(zip(BERAKHLAK_DIMENSIONS, values))
     
     def calculate_coherence(self, text_segments: List[str]) -> float:
-        return random.uniform(0.7, 0.95)
+        return float(self._rng.uniform(0.7, 0.95))
     
     def analyze_sentiment(self, text: str) -> float:
-        return random.uniform(0.4, 0.8)
+        return float(self._rng.uniform(0.4, 0.8))
+    
+    def analyze_berakhlak_values_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        return [self.analyze_berakhlak_values(text) for text in texts]
+    
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[float]:
+        return [self.analyze_sentiment(text) for text in texts]
+    
+    def analyze_all(self, text: str, text_segments: List[str] = None) -> Dict:
+        result = {
+            "berakhlak": self.analyze_berakhlak_values(text),
+            "sentiment": self.analyze_sentiment(text)
+        }
+        if text_segments is not None:
+            result["coherence"] = self.calculate_coherence(text_segments)
+        return result
     
     def cleanup(self):
         pass
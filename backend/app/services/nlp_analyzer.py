@@ -1,19 +1,202 @@
-from sentence_transformers import SentenceTransformer
-from typing import Dict, List
+from typing import Dict, List, Optional
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import importlib.util
+import threading
 import numpy as np
 import logging
 
+from ..core.config import settings
+
 logger = logging.getLogger(__name__)
 
-# Check if sentence transformer is available
+# Check if sentence transformer is available without importing it (torch is heavy);
+# the actual import happens in NLPAnalyzer.initialize()
+SENTENCE_TRANSFORMER_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+if not SENTENCE_TRANSFORMER_AVAILABLE:
+    logger.warning("Sentence transformer not available - only the int8 ONNX encoder can be used")
+
+# Optional: Aho-Corasick automaton for single-pass keyword matching
 try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMER_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    SENTENCE_TRANSFORMER_AVAILABLE = False
-    logger.warning("Sentence transformer not available - will use keyword matching for sentiment")
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: Numba JIT for the post-encode sentiment scoring
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Label indices returned by _sentiment_from_similarities
+SENTIMENT_LABELS = ('neutral', 'positive', 'negative')
+
+@njit(cache=True, fastmath=True)
+def _sentiment_from_similarities(positive_similarities, negative_similarities):
+    """
+    Map reference similarities to (score, label_index, confidence).
+    Score range: 0.0 (very negative) to 1.0 (very positive), 0.5 is neutral.
+    """
+    max_positive = positive_similarities.max()
+    max_negative = negative_similarities.max()
+    
+    if max_positive > max_negative:
+        # More positive: score between 0.5 and 1.0
+        confidence = max_positive
+        score = 0.5 + (max_positive * 0.5)
+        label = 1 if score >= 0.65 else 0
+    elif max_negative > max_positive:
+        # More negative: score between 0.0 and 0.5
+        confidence = max_negative
+        score = 0.5 - (max_negative * 0.5)
+        label = 2 if score <= 0.35 else 0
+    else:
+        confidence = max_positive
+        score = 0.5
+        label = 0
+    
+    # Ensure score is in valid range
+    score = min(max(score, 0.0), 1.0)
+    return score, label, confidence
+
+# Max entries kept in the per-text embedding / sentiment LRU caches (~1.5KB per embedding)
+TEXT_CACHE_SIZE = 4096
+
+SENTENCE_MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+# Optional int8 ONNX export of SENTENCE_MODEL_NAME, looked up under settings.MODELS_DIR.
+# Create it with:
+#   optimum-cli export onnx --model sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2 minilm-onnx/
+#   ORTQuantizer.from_pretrained("minilm-onnx").quantize(
+#       save_dir="<MODELS_DIR>/minilm-int8",
+#       quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False))
+# The directory must contain the quantized .onnx file and tokenizer.json.
+ONNX_ENCODER_DIR = "minilm-int8"
+ONNX_ENCODER_FILES = ("model_quantized.onnx", "model.onnx")
+ONNX_MAX_SEQ_LENGTH = 128
+
+# Sentiment is taken from the keyword scan alone (no transformer) for utterances
+# shorter than this many words or when the keyword confidence reaches the threshold
+SHORT_UTTERANCE_WORDS = 5
+KEYWORD_FAST_PATH_CONFIDENCE = 0.6
+
+# Byte alignment of the reference matrices (one cache line / AVX-512 register);
+# row-major float32 keeps the similarity matmuls on BLAS's SIMD sgemv/sgemm kernels
+MATRIX_ALIGNMENT = 64
+
+def _aligned_float32(matrix: np.ndarray, alignment: int = MATRIX_ALIGNMENT) -> np.ndarray:
+    """Copy `matrix` into a C-contiguous float32 array whose data starts on an `alignment`-byte boundary"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    buffer = np.empty(matrix.nbytes + alignment, dtype=np.uint8)
+    offset = (-buffer.ctypes.data) % alignment
+    aligned = buffer[offset:offset + matrix.nbytes].view(np.float32).reshape(matrix.shape)
+    aligned[...] = matrix
+    return aligned
+
+class OnnxSentenceEncoder:
+    """
+    Minimal ONNX Runtime replacement for SentenceTransformer.encode():
+    tokenize -> run -> mean pooling -> (optional) L2 normalization, float32 output.
+    """
+    
+    def __init__(self, model_dir: Path):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+        
+        model_path = next(model_dir / name for name in ONNX_ENCODER_FILES if (model_dir / name).exists())
+        self.session = ort.InferenceSession(str(model_path), providers=['CPUExecutionProvider'])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        pad_id = self.tokenizer.token_to_id("<pad>")
+        self.tokenizer.enable_padding(pad_id=pad_id if pad_id is not None else 0, pad_token="<pad>")
+        self.tokenizer.enable_truncation(max_length=ONNX_MAX_SEQ_LENGTH)
+    
+    @classmethod
+    def load(cls) -> Optional["OnnxSentenceEncoder"]:
+        """Return an encoder if the quantized export and onnxruntime are available, else None"""
+        model_dir = Path(settings.MODELS_DIR) / ONNX_ENCODER_DIR
+        if not (model_dir / "tokenizer.json").exists():
+            return None
+        if not any((model_dir / name).exists() for name in ONNX_ENCODER_FILES):
+            return None
+        if importlib.util.find_spec("onnxruntime") is None:
+            logger.warning("ONNX sentence encoder found but onnxruntime is not installed")
+            return None
+        
+        try:
+            return cls(model_dir)
+        except Exception as e:
+            logger.error("Failed to load ONNX sentence encoder: %s", e)
+            return None
+    
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(list(texts[start:start + batch_size]))
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            
+            feed = {'input_ids': input_ids, 'attention_mask': attention_mask}
+            if 'token_type_ids' in self.input_names:
+                feed['token_type_ids'] = np.zeros_like(input_ids)
+            token_embeddings = self.session.run(None, feed)[0]
+            
+            # Mean pooling over non-padding tokens
+            mask = attention_mask[:, :, None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled.astype(np.float32, copy=False))
+        
+        embeddings = np.concatenate(batches) if batches else np.empty((0, 0), dtype=np.float32)
+        if normalize_embeddings and embeddings.size:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
 
 class NLPAnalyzer:
+    # Reference sentences for positive and negative sentiment (Indonesian)
+    POSITIVE_REFERENCES = [
+        "Saya sangat senang dan puas dengan pengalaman ini",
+        "Ini adalah hal yang sangat baik dan positif",
+        "Saya merasa optimis dan bersemangat tentang ini",
+        "Pengalaman yang luar biasa dan menyenangkan",
+        "Saya sangat antusias dan termotivasi"
+    ]
+    
+    NEGATIVE_REFERENCES = [
+        "Saya sangat kecewa dan tidak puas dengan ini",
+        "Ini adalah pengalaman yang buruk dan negatif",
+        "Saya merasa pesimis dan tidak yakin tentang ini",
+        "Pengalaman yang mengecewakan dan tidak menyenangkan",
+        "Saya merasa frustasi dan tidak termotivasi"
+    ]
+    
+    # Sentiment keywords for the keyword-based fallback
+    POSITIVE_WORDS = [
+        "baik", "bagus", "senang", "suka", "positif", "setuju", "ya", "benar",
+        "hebat", "luar biasa", "sempurna", "optimal", "efektif", "berhasil",
+        "memuaskan", "antusias", "termotivasi", "bersemangat", "optimis",
+        "sangat baik", "excellent", "mantap", "oke", "siap", "mampu"
+    ]
+    
+    NEGATIVE_WORDS = [
+        "buruk", "jelek", "sedih", "tidak", "negatif", "salah", "kurang",
+        "gagal", "mengecewakan", "pesimis", "sulit", "masalah", "kesulitan",
+        "lemah", "kurang baik", "tidak baik", "belum", "susah", "tidak mampu",
+        "tidak bisa", "tidak dapat", "tidak siap"
+    ]
+    
     def __init__(self):
         self.model = None
         self.berakhlak_keywords = {
@@ -77,39 +260,176 @@ class NLPAnalyzer:
                 "Saya aktif berkolaborasi dan berkontribusi dalam tim"
             ]
         }
+        
+        # LRU caches shared by all request threads; every access goes through _cache_lock
+        self._emb_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._sentiment_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Serializes the one-time model load in initialize()
+        self._init_lock = threading.Lock()
+        
+        self._sentiment_automaton = None
+        self._berakhlak_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._build_keyword_automata()
+    
+    def _build_keyword_automata(self):
+        """Build Aho-Corasick automata so each text is scanned once for all keywords"""
+        self._sentiment_automaton = ahocorasick.Automaton()
+        for polarity, words in (('positive', self.POSITIVE_WORDS), ('negative', self.NEGATIVE_WORDS)):
+            for word in words:
+                self._sentiment_automaton.add_word(word, polarity)
+        self._sentiment_automaton.make_automaton()
+        
+        keyword_dimensions = {}
+        for dimension, keywords in self.berakhlak_keywords.items():
+            for keyword in keywords:
+                keyword_dimensions.setdefault(keyword, []).append(dimension)
+        self._berakhlak_automaton = ahocorasick.Automaton()
+        for keyword, dimensions in keyword_dimensions.items():
+            self._berakhlak_automaton.add_word(keyword, (keyword, tuple(dimensions)))
+        self._berakhlak_automaton.make_automaton()
+    
+    def _count_berakhlak_keywords(self, text_lower: str) -> Dict[str, int]:
+        """Number of distinct keywords of each dimension present in the text"""
+        if self._berakhlak_automaton is None:
+            return {
+                dimension: sum(1 for keyword in keywords if keyword in text_lower)
+                for dimension, keywords in self.berakhlak_keywords.items()
+            }
+        
+        found = set()
+        counts = dict.fromkeys(self.berakhlak_keywords, 0)
+        for _, (keyword, dimensions) in self._berakhlak_automaton.iter(text_lower):
+            if keyword in found:
+                continue
+            found.add(keyword)
+            for dimension in dimensions:
+                counts[dimension] += 1
+        return counts
     
     def initialize(self):
-        if self.model is None:
-            logger.info("Loading sentence transformer model")
-            self.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+        # self.model is published last: a non-None model means the reference
+        # matrices are ready, so callers can skip the lock once loaded
+        if self.model is not None:
+            return
+        with self._init_lock:
+            if self.model is not None:
+                return
+            
+            # Prefer the int8 ONNX export (same embeddings, much cheaper on CPU)
+            model = OnnxSentenceEncoder.load()
+            if model is not None:
+                logger.info("Loaded int8 ONNX sentence encoder")
+            else:
+                logger.info("Loading sentence transformer model")
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(SENTENCE_MODEL_NAME)
             
-            self.berakhlak_embeddings = {}
+            # All example sentences stacked into one (num_examples, D) matrix;
+            # each dimension owns a contiguous row slice
+            berakhlak_slices = {}
+            all_examples = []
             for dimension, examples in self.berakhlak_examples.items():
-                self.berakhlak_embeddings[dimension] = self.model.encode(examples)
+                berakhlak_slices[dimension] = slice(len(all_examples), len(all_examples) + len(examples))
+                all_examples.extend(examples)
+            self._berakhlak_slices = berakhlak_slices
+            self._berakhlak_matrix = _aligned_float32(self._encode_batch(all_examples, model))
             
+            # Sentiment references never change, so encode them once into a single
+            # (num_positive + num_negative, D) matrix: positive rows first, then negative
+            self._sent_matrix = _aligned_float32(
+                self._encode_batch(self.POSITIVE_REFERENCES + self.NEGATIVE_REFERENCES, model)
+            )
+            self._sent_split = len(self.POSITIVE_REFERENCES)
+            
+            self.model = model
             logger.info("NLP model loaded successfully")
     
+    def _encode_batch(self, texts: List[str], model=None) -> np.ndarray:
+        """Encode texts into a contiguous float32 matrix of unit-length rows (with self.model by default)"""
+        if model is None:
+            model = self.model
+        embeddings = model.encode(texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+    
+    @staticmethod
+    def _text_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def _cache_get(self, cache: OrderedDict, key: bytes):
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+    
+    def _cache_put(self, cache: OrderedDict, key: bytes, value):
+        with self._cache_lock:
+            cache[key] = value
+            if len(cache) > TEXT_CACHE_SIZE:
+                cache.popitem(last=False)
+    
+    def _encode_text(self, text: str) -> np.ndarray:
+        """Encode a single text into a unit-length embedding (LRU-cached per text)"""
+        key = self._text_key(text)
+        text_vec = self._cache_get(self._emb_cache, key)
+        if text_vec is None:
+            text_vec = self._encode_batch([text])[0]
+            self._cache_put(self._emb_cache, key, text_vec)
+        return text_vec
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode many texts into a (len(texts), D) matrix. Cached texts are reused;
+        the rest go through the model in a single batched encode() call.
+        """
+        keys = [self._text_key(text) for text in texts]
+        vectors = [self._cache_get(self._emb_cache, key) for key in keys]
+        
+        missing = [i for i, vec in enumerate(vectors) if vec is None]
+        if missing:
+            # Deduplicate so repeated utterances are only encoded once
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = dict(zip(unique_texts, self._encode_batch(unique_texts)))
+            for i in missing:
+                vectors[i] = encoded[texts[i]]
+                self._cache_put(self._emb_cache, keys[i], vectors[i])
+        
+        if not vectors:
+            return np.empty((0, self._berakhlak_matrix.shape[1]), dtype=np.float32)
+        return np.stack(vectors)
+    
     def analyze_berakhlak_values(self, text: str) -> Dict[str, float]:
         self.initialize()
+        return self._score_berakhlak(text, self._encode_text(text))
+    
+    def analyze_berakhlak_values_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """BerAKHLAK scores for many texts with one encode and one (B, K) matmul"""
+        if not texts:
+            return []
         
-        text_lower = text.lower()
+        self.initialize()
+        
+        similarities = self._encode_texts(texts) @ self._berakhlak_matrix.T
+        return [
+            self._combine_berakhlak_scores(text, row)
+            for text, row in zip(texts, similarities)
+        ]
+    
+    def _score_berakhlak(self, text: str, text_vec: np.ndarray) -> Dict[str, float]:
+        # Score against every example sentence in a single matmul
+        return self._combine_berakhlak_scores(text, self._berakhlak_matrix @ text_vec)
+    
+    def _combine_berakhlak_scores(self, text: str, similarities: np.ndarray) -> Dict[str, float]:
+        keyword_counts = self._count_berakhlak_keywords(text.lower())
         scores = {}
         
-        for dimension, keywords in self.berakhlak_keywords.items():
-            keyword_score = sum(1 for keyword in keywords if keyword in text_lower)
-            keyword_score = min(keyword_score / 3.0, 1.0)
-            
-            text_embedding = self.model.encode([text])
-            dimension_embeddings = self.berakhlak_embeddings[dimension]
-            
-            similarities = []
-            for dim_emb in dimension_embeddings:
-                sim = np.dot(text_embedding[0], dim_emb) / (
-                    np.linalg.norm(text_embedding[0]) * np.linalg.norm(dim_emb)
-                )
-                similarities.append(sim)
+        for dimension in self.berakhlak_keywords:
+            keyword_score = min(keyword_counts[dimension] / 3.0, 1.0)
             
-            semantic_score = max(similarities) if similarities else 0.0
+            dimension_similarities = similarities[self._berakhlak_slices[dimension]]
+            semantic_score = float(dimension_similarities.max()) if dimension_similarities.size else 0.0
             
             final_score = (keyword_score * 0.4 + semantic_score * 0.6)
             scores[dimension] = max(0.0, min(1.0, final_score))
@@ -122,18 +442,38 @@ class NLPAnalyzer:
         
         self.initialize()
         
-        embeddings = self.model.encode(text_segments)
+        embeddings = self._encode_batch(text_segments)
         
-        similarities = []
-        for i in range(len(embeddings) - 1):
-            sim = np.dot(embeddings[i], embeddings[i+1]) / (
-                np.linalg.norm(embeddings[i]) * np.linalg.norm(embeddings[i+1])
-            )
-            similarities.append(sim)
+        # Cosine similarity of each consecutive pair of unit-length rows
+        similarities = np.einsum('ij,ij->i', embeddings[:-1], embeddings[1:])
         
-        coherence = np.mean(similarities)
+        coherence = float(similarities.mean())
         return max(0.0, min(1.0, coherence))
     
+    def analyze_all(self, text: str, text_segments: Optional[List[str]] = None) -> Dict:
+        """
+        Run BerAKHLAK scoring and sentiment analysis off a single encode of `text`.
+        Pass `text_segments` to also compute coherence.
+        
+        Returns dict with 'berakhlak', 'sentiment' and (optionally) 'coherence'.
+        """
+        self.initialize()
+        
+        text_vec = self._encode_text(text)
+        
+        if not text or len(text.strip()) < 5:
+            sentiment = {'score': 0.5, 'label': 'neutral', 'confidence': 0.0}
+        else:
+            sentiment = self._keyword_fast_path(text) or self._analyze_sentiment_semantic(text, text_vec)
+        
+        result = {
+            'berakhlak': self._score_berakhlak(text, text_vec),
+            'sentiment': sentiment
+        }
+        if text_segments is not None:
+            result['coherence'] = self.calculate_coherence(text_segments)
+        return result
+    
     def analyze_sentiment(self, text: str) -> Dict:
         """
         Analyze sentiment using semantic similarity with positive/negative reference sentences.
@@ -146,83 +486,106 @@ class NLPAnalyzer:
         
         self.initialize()
         
-        # Use semantic similarity for accurate sentiment analysis
-        if self.model and SENTENCE_TRANSFORMER_AVAILABLE:
-            return self._analyze_sentiment_semantic(text)
+        key = self._text_key(text)
+        cached = self._cache_get(self._sentiment_cache, key)
+        if cached is not None:
+            return dict(cached)
+        
+        # Use semantic similarity for accurate sentiment analysis, unless the
+        # cheap keyword scan is already conclusive
+        fast_result = self._keyword_fast_path(text)
+        if fast_result is not None:
+            result = fast_result
+        elif self.model is not None:
+            result = self._analyze_sentiment_semantic(text)
         else:
             # Fallback to improved keyword-based analysis
-            return self._analyze_sentiment_keywords(text)
+            result = self._analyze_sentiment_keywords(text)
+        
+        self._cache_put(self._sentiment_cache, key, dict(result))
+        return result
     
-    def _analyze_sentiment_semantic(self, text: str) -> Dict:
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict]:
         """
-        Semantic sentiment analysis using sentence transformers.
-        Compares text with positive and negative reference sentences.
+        Sentiment for many texts (e.g. all transcript segments of an interview).
+        Uncached texts are encoded together in one batched call instead of one
+        encode() per text; results match analyze_sentiment().
         """
-        # Reference sentences for positive and negative sentiment (Indonesian)
-        positive_references = [
-            "Saya sangat senang dan puas dengan pengalaman ini",
-            "Ini adalah hal yang sangat baik dan positif",
-            "Saya merasa optimis dan bersemangat tentang ini",
-            "Pengalaman yang luar biasa dan menyenangkan",
-            "Saya sangat antusias dan termotivasi"
-        ]
+        results: List[Optional[Dict]] = [None] * len(texts)
+        pending = []
         
-        negative_references = [
-            "Saya sangat kecewa dan tidak puas dengan ini",
-            "Ini adalah pengalaman yang buruk dan negatif",
-            "Saya merasa pesimis dan tidak yakin tentang ini",
-            "Pengalaman yang mengecewakan dan tidak menyenangkan",
-            "Saya merasa frustasi dan tidak termotivasi"
-        ]
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 5:
+                results[i] = {'score': 0.5, 'label': 'neutral', 'confidence': 0.0}
+                continue
+            cached = self._cache_get(self._sentiment_cache, self._text_key(text))
+            if cached is None:
+                cached = self._keyword_fast_path(text)
+            if cached is not None:
+                results[i] = dict(cached)
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        self.initialize()
+        
+        pending_texts = [texts[i] for i in pending]
+        computed = None
+        if self.model is not None:
+            try:
+                similarities = self._encode_texts(pending_texts) @ self._sent_matrix.T
+                split = self._sent_split
+                computed = []
+                for row in similarities:
+                    score, label_index, confidence = _sentiment_from_similarities(row[:split], row[split:])
+                    computed.append({
+                        'score': float(score),
+                        'label': SENTIMENT_LABELS[label_index],
+                        'confidence': float(confidence)
+                    })
+            except Exception as e:
+                logger.error("Error in batch semantic sentiment analysis: %s", e)
+                computed = None
         
+        if computed is None:
+            computed = [self._analyze_sentiment_keywords(text) for text in pending_texts]
+        
+        for i, result in zip(pending, computed):
+            self._cache_put(self._sentiment_cache, self._text_key(texts[i]), dict(result))
+            results[i] = result
+        return results
+    
+    def _keyword_fast_path(self, text: str) -> Optional[Dict]:
+        """
+        Keyword result for short utterances ("oke", "ya, tidak") or when the keyword
+        scan is already confident; None means the semantic path should decide.
+        """
+        keyword_result = self._analyze_sentiment_keywords(text)
+        if (keyword_result['confidence'] >= KEYWORD_FAST_PATH_CONFIDENCE
+                or len(text.split()) < SHORT_UTTERANCE_WORDS):
+            return keyword_result
+        return None
+    
+    def _analyze_sentiment_semantic(self, text: str, text_vec: Optional[np.ndarray] = None) -> Dict:
+        """
+        Semantic sentiment analysis using sentence transformers.
+        Compares text with positive and negative reference sentences
+        (reference embeddings are precomputed in initialize()).
+        """
         try:
-            # Encode text and references
-            text_embedding = self.model.encode([text])[0]
-            positive_embeddings = self.model.encode(positive_references)
-            negative_embeddings = self.model.encode(negative_references)
-            
-            # Calculate similarities
-            positive_similarities = [
-                np.dot(text_embedding, pos_emb) / (
-                    np.linalg.norm(text_embedding) * np.linalg.norm(pos_emb)
-                ) for pos_emb in positive_embeddings
-            ]
+            # Only the input text needs encoding; references are cached
+            if text_vec is None:
+                text_vec = self._encode_text(text)
             
-            negative_similarities = [
-                np.dot(text_embedding, neg_emb) / (
-                    np.linalg.norm(text_embedding) * np.linalg.norm(neg_emb)
-                ) for neg_emb in negative_embeddings
-            ]
-            
-            # Get max similarities
-            max_positive = max(positive_similarities)
-            max_negative = max(negative_similarities)
-            avg_positive = np.mean(positive_similarities)
-            avg_negative = np.mean(negative_similarities)
-            
-            # Calculate sentiment score
-            # Range: 0.0 (very negative) to 1.0 (very positive)
-            # 0.5 is neutral
-            if max_positive > max_negative:
-                # More positive
-                confidence = max_positive
-                # Score between 0.5 and 1.0
-                score = 0.5 + (max_positive * 0.5)
-                label = 'positive' if score >= 0.65 else 'neutral'
-            elif max_negative > max_positive:
-                # More negative
-                confidence = max_negative
-                # Score between 0.0 and 0.5
-                score = 0.5 - (max_negative * 0.5)
-                label = 'negative' if score <= 0.35 else 'neutral'
-            else:
-                # Neutral
-                confidence = max(max_positive, max_negative)
-                score = 0.5
-                label = 'neutral'
+            # Cosine similarities against all unit-length reference rows in one matmul
+            similarities = self._sent_matrix @ text_vec
             
-            # Ensure score is in valid range
-            score = max(0.0, min(1.0, score))
+            score, label_index, confidence = _sentiment_from_similarities(
+                similarities[:self._sent_split], similarities[self._sent_split:]
+            )
+            label = SENTIMENT_LABELS[label_index]
             
             return {
                 'score': float(score),
@@ -239,26 +602,18 @@ class NLPAnalyzer:
         """
         Improved keyword-based sentiment analysis (fallback).
         """
-        # Expanded keyword lists for better coverage
-        positive_words = [
-            "baik", "bagus", "senang", "suka", "positif", "setuju", "ya", "benar",
-            "hebat", "luar biasa", "sempurna", "optimal", "efektif", "berhasil",
-            "memuaskan", "antusias", "termotivasi", "bersemangat", "optimis",
-            "sangat baik", "excellent", "mantap", "oke", "siap", "mampu"
-        ]
-        
-        negative_words = [
-            "buruk", "jelek", "sedih", "tidak", "negatif", "salah", "kurang",
-            "gagal", "mengecewakan", "pesimis", "sulit", "masalah", "kesulitan",
-            "lemah", "kurang baik", "tidak baik", "belum", "susah", "tidak mampu",
-            "tidak bisa", "tidak dapat", "tidak siap"
-        ]
-        
         text_lower = text.lower()
         
         # Count occurrences (not just presence)
-        positive_count = sum(text_lower.count(word) for word in positive_words)
-        negative_count = sum(text_lower.count(word) for word in negative_words)
+        if self._sentiment_automaton is not None:
+            counts = {'positive': 0, 'negative': 0}
+            for _, polarity in self._sentiment_automaton.iter(text_lower):
+                counts[polarity] += 1
+            positive_count = counts['positive']
+            negative_count = counts['negative']
+        else:
+            positive_count = sum(text_lower.count(word) for word in self.POSITIVE_WORDS)
+            negative_count = sum(text_lower.count(word) for word in self.NEGATIVE_WORDS)
         
         total = positive_count + negative_count
         
@@ -295,6 +650,9 @@ class NLPAnalyzer:
         return result['score']
     
     def cleanup(self):
+        with self._cache_lock:
+            self._emb_cache.clear()
+            self._sentiment_cache.clear()
         if self.model is not None:
             del self.model
             self.model = None
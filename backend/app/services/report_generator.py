@@ -1,20 +1,74 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
-from typing import Dict
-import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+import logging
 import os
+import orjson
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+TRANSCRIPT_ENTRY_LIMIT = 50
+
+BERAKHLAK_DIMENSIONS = [
+    ('Berorientasi Pelayanan', 'berorientasi_pelayanan'),
+    ('Akuntabel', 'akuntabel'),
+    ('Kompeten', 'kompeten'),
+    ('Harmonis', 'harmonis'),
+    ('Loyal', 'loyal'),
+    ('Adaptif', 'adaptif'),
+    ('Kolaboratif', 'kolaboratif')
+]
+
+# Jinja2 environment, weasyprint module and parsed stylesheet are shared by every
+# HTML report; templates are compiled once and cached by the environment
+_template_env = None
+_weasyprint = None
+_report_stylesheet = None
+
+def _load_weasyprint():
+    """Import weasyprint once; returns None if it (or its Pango libraries) is missing"""
+    global _weasyprint
+    if _weasyprint is None:
+        try:
+            import weasyprint
+            _weasyprint = weasyprint
+        except (ImportError, OSError) as e:
+            logger.warning("weasyprint not available - using reportlab PDF generator: %s", e)
+            _weasyprint = False
+    return _weasyprint or None
+
+def _get_template_env():
+    global _template_env
+    if _template_env is None:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        _template_env = Environment(
+            loader=FileSystemLoader(str(TEMPLATES_DIR)),
+            autoescape=select_autoescape(['html']),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+    return _template_env
+
+def _get_report_stylesheet():
+    global _report_stylesheet
+    if _report_stylesheet is None:
+        _report_stylesheet = _weasyprint.CSS(filename=str(TEMPLATES_DIR / "report.css"))
+    return _report_stylesheet
 
 class ReportGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        # reportlab is only imported (and styles built) when a PDF is first generated
+        self.styles = None
     
     def _setup_custom_styles(self):
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import TableStyle
+        from reportlab.lib.enums import TA_CENTER
+        
+        self.styles = getSampleStyleSheet()
         self.styles.add(ParagraphStyle(
             name='CustomTitle',
             parent=self.styles['Heading1'],
@@ -32,6 +86,82 @@ class ReportGenerator:
             spaceAfter=12,
             spaceBefore=12
         ))
+        
+        # One paragraph per transcript entry: bold "[mm:ss] Speaker:" line, then the text
+        self.styles.add(ParagraphStyle(
+            name='TranscriptEntry',
+            parent=self.styles['Normal'],
+            spaceAfter=0.1*inch
+        ))
+        
+        self._recommendation_styles = {}
+        
+        # Table styles are identical for every report, so build them once
+        self._info_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e2e8f0')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ])
+        
+        self._berakhlak_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        self._behavioral_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        self._overall_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#48bb78')),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+    
+    def _get_recommendation_style(self, recommendation: str) -> "ParagraphStyle":
+        style = self._recommendation_styles.get(recommendation)
+        if style is None:
+            from reportlab.lib import colors
+            from reportlab.lib.styles import ParagraphStyle
+            from reportlab.lib.enums import TA_CENTER
+            
+            rec_color = {
+                'LAYAK': colors.green,
+                'DIPERTIMBANGKAN': colors.orange,
+                'TIDAK_LAYAK': colors.red
+            }.get(recommendation, colors.grey)
+            
+            style = ParagraphStyle(
+                name='Recommendation',
+                parent=self.styles['Normal'],
+                fontSize=16,
+                textColor=rec_color,
+                alignment=TA_CENTER,
+                fontName='Helvetica-Bold'
+            )
+            self._recommendation_styles[recommendation] = style
+        return style
     
     def generate_pdf_report(
         self,
@@ -40,6 +170,13 @@ class ReportGenerator:
         transcript_data: list,
         output_path: str
     ) -> str:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak
+        
+        if self.styles is None:
+            self._setup_custom_styles()
+        
         doc = SimpleDocTemplate(output_path, pagesize=A4)
         story = []
         
@@ -56,118 +193,41 @@ class ReportGenerator:
         ]
         
         info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e2e8f0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
+        info_table.setStyle(self._info_table_style)
         story.append(info_table)
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph("NILAI BerAKHLAK", self.styles['SectionHeader']))
         
-        berakhlak_dimensions = [
-            ('Berorientasi Pelayanan', 'berorientasi_pelayanan'),
-            ('Akuntabel', 'akuntabel'),
-            ('Kompeten', 'kompeten'),
-            ('Harmonis', 'harmonis'),
-            ('Loyal', 'loyal'),
-            ('Adaptif', 'adaptif'),
-            ('Kolaboratif', 'kolaboratif')
-        ]
-        
         berakhlak_data = [['Dimensi', 'Skor AI', 'Skor Manual', 'Rata-rata']]
-        for label, key in berakhlak_dimensions:
-            ai_score = scores_data.get(f'{key}_ai', 0.0) or 0.0
-            manual_score = scores_data.get(f'{key}_manual', 0.0) or 0.0
-            avg = (ai_score + manual_score) / 2 if manual_score > 0 else ai_score
-            berakhlak_data.append([
-                label,
-                f"{ai_score:.2f}",
-                f"{manual_score:.2f}" if manual_score > 0 else "-",
-                f"{avg:.2f}"
-            ])
+        berakhlak_data.extend(self._berakhlak_rows(scores_data))
         
         berakhlak_table = Table(berakhlak_data, colWidths=[2.5*inch, 1*inch, 1*inch, 1*inch])
-        berakhlak_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        berakhlak_table.setStyle(self._berakhlak_table_style)
         story.append(berakhlak_table)
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph("INDIKATOR PERILAKU", self.styles['SectionHeader']))
         
-        behavioral_data = [
-            ['Indikator', 'Skor'],
-            ['Stabilitas Emosi', f"{scores_data.get('emotion_stability', 0.0):.2f}/5.00"],
-            ['Kejelasan Komunikasi', f"{scores_data.get('speech_clarity', 0.0):.2f}/5.00"],
-            ['Koherensi Jawaban', f"{scores_data.get('answer_coherence', 0.0):.2f}/5.00"]
-        ]
+        behavioral_data = [['Indikator', 'Skor']] + self._behavioral_rows(scores_data)
         
         behavioral_table = Table(behavioral_data, colWidths=[3*inch, 2*inch])
-        behavioral_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        behavioral_table.setStyle(self._behavioral_table_style)
         story.append(behavioral_table)
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph("SKOR KESELURUHAN", self.styles['SectionHeader']))
         
-        overall_data = [
-            ['Metrik', 'Nilai'],
-            ['Skor AI', f"{scores_data.get('overall_ai_score', 0.0):.2f}/5.00"],
-            ['Skor Manual', f"{scores_data.get('overall_manual_score', 0.0):.2f}/5.00" if scores_data.get('overall_manual_score') else "-"],
-            ['Skor Akhir', f"{scores_data.get('final_score', 0.0):.2f}/5.00"]
-        ]
+        overall_data = [['Metrik', 'Nilai']] + self._overall_rows(scores_data)
         
         overall_table = Table(overall_data, colWidths=[3*inch, 2*inch])
-        overall_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#48bb78')),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, -1), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        overall_table.setStyle(self._overall_table_style)
         story.append(overall_table)
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph("REKOMENDASI", self.styles['SectionHeader']))
         recommendation = interview_data.get('recommendation', 'dipertimbangkan').upper()
-        rec_color = {
-            'LAYAK': colors.green,
-            'DIPERTIMBANGKAN': colors.orange,
-            'TIDAK_LAYAK': colors.red
-        }.get(recommendation, colors.grey)
-        
-        rec_style = ParagraphStyle(
-            name='Recommendation',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            textColor=rec_color,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        story.append(Paragraph(recommendation, rec_style))
+        story.append(Paragraph(recommendation, self._get_recommendation_style(recommendation)))
         story.append(Spacer(1, 0.3*inch))
         
         if scores_data.get('ai_analysis_summary'):
@@ -187,24 +247,100 @@ class ReportGenerator:
             story.append(PageBreak())
             story.append(Paragraph("TRANSKRIP WAWANCARA", self.styles['SectionHeader']))
             
-            for entry in transcript_data[:50]:
-                speaker = entry.get('speaker', 'Unknown')
-                text = entry.get('text', '')
-                timestamp = entry.get('timestamp', 0)
-                
-                speaker_style = ParagraphStyle(
-                    name='Speaker',
-                    parent=self.styles['Normal'],
-                    fontName='Helvetica-Bold',
-                    fontSize=10
-                )
-                story.append(Paragraph(f"[{self._format_timestamp(timestamp)}] {speaker}:", speaker_style))
-                story.append(Paragraph(text, self.styles['Normal']))
-                story.append(Spacer(1, 0.1*inch))
+            for timestamp_text, speaker, text in self._transcript_lines(transcript_data):
+                story.append(Paragraph(
+                    f"<b>[{timestamp_text}] {speaker}:</b><br/>{text}",
+                    self.styles['TranscriptEntry']
+                ))
         
         doc.build(story)
         return output_path
     
+    def generate_pdf_report_html(
+        self,
+        interview_data: Dict,
+        scores_data: Dict,
+        transcript_data: list,
+        output_path: str
+    ) -> str:
+        """
+        Render the report through the cached Jinja2 template and weasyprint.
+        Falls back to the reportlab generator when weasyprint is not installed.
+        """
+        weasyprint = _load_weasyprint()
+        if weasyprint is None:
+            return self.generate_pdf_report(interview_data, scores_data, transcript_data, output_path)
+        
+        html = _get_template_env().get_template("report.html").render(
+            info={
+                'candidate_name': interview_data.get('candidate_name', '-'),
+                'position': interview_data.get('position', '-'),
+                'started_at': self._format_datetime(interview_data.get('started_at')),
+                'duration': f"{interview_data.get('duration_seconds', 0) // 60} menit",
+                'interviewer_name': interview_data.get('interviewer_name', '-'),
+                'status': interview_data.get('status', '-').upper()
+            },
+            berakhlak_rows=self._berakhlak_rows(scores_data),
+            behavioral_rows=self._behavioral_rows(scores_data),
+            overall_rows=self._overall_rows(scores_data),
+            recommendation=interview_data.get('recommendation', 'dipertimbangkan').upper(),
+            ai_analysis_summary=scores_data.get('ai_analysis_summary'),
+            interviewer_notes=scores_data.get('interviewer_notes'),
+            transcript=[
+                {'timestamp': timestamp_text, 'speaker': speaker, 'text': text}
+                for timestamp_text, speaker, text in self._transcript_lines(transcript_data or [])
+            ]
+        )
+        
+        weasyprint.HTML(string=html, base_url=str(TEMPLATES_DIR)).write_pdf(
+            output_path, stylesheets=[_get_report_stylesheet()]
+        )
+        return output_path
+    
+    @staticmethod
+    def _berakhlak_rows(scores_data: Dict) -> List[List[str]]:
+        rows = []
+        for label, key in BERAKHLAK_DIMENSIONS:
+            ai_score = scores_data.get(f'{key}_ai', 0.0) or 0.0
+            manual_score = scores_data.get(f'{key}_manual', 0.0) or 0.0
+            avg = (ai_score + manual_score) / 2 if manual_score > 0 else ai_score
+            rows.append([
+                label,
+                f"{ai_score:.2f}",
+                f"{manual_score:.2f}" if manual_score > 0 else "-",
+                f"{avg:.2f}"
+            ])
+        return rows
+    
+    @staticmethod
+    def _behavioral_rows(scores_data: Dict) -> List[List[str]]:
+        return [
+            ['Stabilitas Emosi', f"{scores_data.get('emotion_stability', 0.0):.2f}/5.00"],
+            ['Kejelasan Komunikasi', f"{scores_data.get('speech_clarity', 0.0):.2f}/5.00"],
+            ['Koherensi Jawaban', f"{scores_data.get('answer_coherence', 0.0):.2f}/5.00"]
+        ]
+    
+    @staticmethod
+    def _overall_rows(scores_data: Dict) -> List[List[str]]:
+        return [
+            ['Skor AI', f"{scores_data.get('overall_ai_score', 0.0):.2f}/5.00"],
+            ['Skor Manual', f"{scores_data.get('overall_manual_score', 0.0):.2f}/5.00" if scores_data.get('overall_manual_score') else "-"],
+            ['Skor Akhir', f"{scores_data.get('final_score', 0.0):.2f}/5.00"]
+        ]
+    
+    def _transcript_lines(self, transcript_data: list) -> List[Tuple[str, str, str]]:
+        """(mm:ss, speaker, text) for the first TRANSCRIPT_ENTRY_LIMIT entries"""
+        # Entries often share the same second; format each mm:ss only once
+        formatted_timestamps: Dict[int, str] = {}
+        lines = []
+        for entry in transcript_data[:TRANSCRIPT_ENTRY_LIMIT]:
+            seconds = int(entry.get('timestamp', 0) or 0)
+            timestamp_text = formatted_timestamps.get(seconds)
+            if timestamp_text is None:
+                timestamp_text = formatted_timestamps[seconds] = self._format_timestamp(seconds)
+            lines.append((timestamp_text, entry.get('speaker', 'Unknown'), entry.get('text', '')))
+        return lines
+    
     def generate_json_report(
         self,
         interview_data: Dict,
@@ -221,11 +357,24 @@ class ReportGenerator:
             "generated_at": datetime.utcnow().isoformat()
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(
+                report_data,
+                default=self._json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
         
         return output_path
     
+    @staticmethod
+    def _json_default(obj):
+        # orjson handles datetime/date natively; this covers the remaining odd types
+        if hasattr(obj, 'isoformat'):
+            return obj.isoformat()
+        if hasattr(obj, 'item'):
+            return obj.item()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
     def _format_datetime(self, dt) -> str:
         if isinstance(dt, str):
             dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
@@ -1,10 +1,22 @@
-import librosa
 import numpy as np
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Full-length decodes (analyze_speech_clarity) are kept per service instance so a
+# following predict_emotion on the same file can slice them instead of decoding again;
+# the cache is bounded by total sample bytes
+AUDIO_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FEATURE_DURATION_SECONDS = 3.0
+
+# Feature vector layout: 40 MFCC means, 12 chroma means, ZCR mean, RMS mean
+N_MFCC = 40
+N_CHROMA = 12
+N_FEATURES = N_MFCC + N_CHROMA + 2
+
 class SpeechEmotionService:
     def __init__(self):
         self.sample_rate = 16000
@@ -18,36 +30,70 @@ class SpeechEmotionService:
             6: "disgust",
             7: "surprised"
         }
+        # path -> ((mtime_ns, size), samples, sample rate), oldest first
+        self._audio_cache: "OrderedDict[str, Tuple[Tuple[int, int], np.ndarray, int]]" = OrderedDict()
+        self._audio_cache_bytes = 0
+    
+    def _load_audio(self, audio_path: str, duration: Optional[float] = None) -> Tuple[np.ndarray, int]:
+        """
+        Decode the first `duration` seconds of a file (all of it when None).
+        Only full-length decodes are cached; a cached decode is reused for any
+        duration until the file's mtime or size changes.
+        """
+        stat = os.stat(audio_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._audio_cache.get(audio_path)
+        if cached is not None:
+            cached_signature, y, sr = cached
+            if cached_signature == signature:
+                self._audio_cache.move_to_end(audio_path)
+                return (y if duration is None else y[:int(sr * duration)]), sr
+            self._evict_audio(audio_path)
+        
+        import librosa
+        y, sr = librosa.load(audio_path, sr=self.sample_rate, duration=duration, dtype=np.float32)
+        if duration is None and y.nbytes <= AUDIO_CACHE_MAX_BYTES:
+            while self._audio_cache_bytes + y.nbytes > AUDIO_CACHE_MAX_BYTES:
+                self._evict_audio(next(iter(self._audio_cache)))
+            self._audio_cache[audio_path] = (signature, y, sr)
+            self._audio_cache_bytes += y.nbytes
+        return y, sr
+    
+    def _evict_audio(self, audio_path: str):
+        _, y, _ = self._audio_cache.pop(audio_path)
+        self._audio_cache_bytes -= y.nbytes
+    
+    def _spectrogram(self, y: np.ndarray) -> np.ndarray:
+        """Power spectrogram shared by the mel / MFCC / chroma features (float32)"""
+        import librosa
+        return (np.abs(librosa.stft(y, dtype=np.complex64)) ** 2).astype(np.float32, copy=False)
     
     def extract_features(self, audio_path: str) -> np.ndarray:
+        # librosa is heavy; import on first use (Python caches the module afterwards)
+        import librosa
         try:
-            y, sr = librosa.load(audio_path, sr=self.sample_rate, duration=3.0)
-            
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40)
-            mfccs_mean = np.mean(mfccs, axis=1)
-            
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-            chroma_mean = np.mean(chroma, axis=1)
+            y, sr = self._load_audio(audio_path, duration=FEATURE_DURATION_SECONDS)
             
-            mel = librosa.feature.melspectrogram(y=y, sr=sr)
-            mel_mean = np.mean(mel, axis=1)
+            # One STFT; mel, MFCC and chroma are all derived from it
+            S = self._spectrogram(y)
+            mel = librosa.feature.melspectrogram(S=S, sr=sr).astype(np.float32, copy=False)
             
+            mfccs = librosa.feature.mfcc(S=librosa.power_to_db(mel), sr=sr, n_mfcc=N_MFCC).astype(np.float32, copy=False)
+            chroma = librosa.feature.chroma_stft(S=S, sr=sr, n_chroma=N_CHROMA).astype(np.float32, copy=False)
             zcr = librosa.feature.zero_crossing_rate(y)
-            zcr_mean = np.mean(zcr)
-            
             rms = librosa.feature.rms(y=y)
-            rms_mean = np.mean(rms)
             
-            features = np.concatenate([
-                mfccs_mean,
-                chroma_mean,
-                [zcr_mean, rms_mean]
-            ])
+            # Reduce straight into the output vector (no per-feature temporaries or concat)
+            features = np.empty(N_FEATURES, dtype=np.float32)
+            np.mean(mfccs, axis=1, out=features[:N_MFCC])
+            np.mean(chroma, axis=1, out=features[N_MFCC:N_MFCC + N_CHROMA])
+            features[-2] = zcr.mean()
+            features[-1] = rms.mean()
             
             return features
         except Exception as e:
             logger.error(f"Error extracting features: {e}")
-            return np.zeros(54)
+            return np.zeros(N_FEATURES, dtype=np.float32)
     
     def predict_emotion(self, audio_path: str) -> Dict:
         features = self.extract_features(audio_path)
@@ -79,8 +125,9 @@ class SpeechEmotionService:
         }
     
     def analyze_speech_clarity(self, audio_path: str) -> float:
+        import librosa
         try:
-            y, sr = librosa.load(audio_path, sr=self.sample_rate)
+            y, sr = self._load_audio(audio_path)
             
             rms = librosa.feature.rms(y=y)[0]
             snr = np.mean(rms) / (np.std(rms) + 1e-6)
@@ -93,3 +140,7 @@ class SpeechEmotionService:
         except Exception as e:
             logger.error(f"Error analyzing clarity: {e}")
             return 0.5
+    
+    def clear_cache(self):
+        self._audio_cache.clear()
+        self._audio_cache_bytes = 0
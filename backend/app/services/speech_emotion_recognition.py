@@ -4,8 +4,11 @@ Analyzes voice characteristics: intonation, pitch, energy, speaking rate
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from collections import deque
 import logging
-from typing import Dict, Optional
+import math
+from typing import Dict, Optional, Tuple, Union
 import io
 import base64
 
@@ -13,14 +16,194 @@ logger = logging.getLogger(__name__)
 
 # Try import audio processing libraries
 try:
-    import librosa
-    import soundfile as sf
+    from scipy.signal import find_peaks
+    from scipy.fft import rfft
     AUDIO_LIBS_AVAILABLE = True
     logger.info("Speech emotion recognition libraries loaded successfully")
 except ImportError as e:
     AUDIO_LIBS_AVAILABLE = False
     logger.warning(f"Audio processing libraries not available: {e}")
 
+# Optional: WORLD vocoder F0 (DIO + StoneMask) for offline full-clip analysis
+try:
+    import pyworld
+    PYWORLD_AVAILABLE = True
+except ImportError:
+    PYWORLD_AVAILABLE = False
+
+# Optional: Numba JIT for the fused per-frame statistics kernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+# Pitch search band for the FFT peak pitch estimator
+PITCH_FMIN = 80.0   # Male voice lower bound
+PITCH_FMAX = 400.0  # Female voice upper bound
+# Frames whose strongest in-band component is quieter than this sine amplitude
+# (~-54 dBFS) are treated as unvoiced
+PITCH_MIN_AMPLITUDE = 0.002
+
+# Framing shared by every per-frame feature (pitch, RMS, ZCR, spectral centroid)
+FRAME_LENGTH = 1024  # 64 ms at 16 kHz
+HOP_LENGTH = 512
+# Chunks shorter than this (200 ms at 16 kHz) get one FFT over the whole chunk
+SINGLE_FRAME_MAX_SAMPLES = 3200
+# Distinct single-frame chunk lengths whose window/frequency grids are kept
+SPECTRAL_GRID_CACHE_SIZE = 32
+# Longest window the scratch buffers cover without allocating (the websocket handler sends 2 s)
+SCRATCH_SECONDS = 2
+
+# Speaking rate is estimated from energy peaks (syllable nuclei) over a longer
+# rolling window (a single chunk is far too short for a tempo estimate).
+# Conversational speech runs at about 4 syllables/s; _classify_emotion
+# normalizes the rate around that baseline.
+SPEAKING_RATE_BASELINE = 240.0  # Syllables per minute
+SPEAKING_RATE_SCALE = 60.0  # One syllable/s faster or slower = one normalized unit
+DEFAULT_TEMPO = SPEAKING_RATE_BASELINE  # Neutral value until the first estimate
+# Syllable peaks closer than this are merged; a peak must sit above the median
+# envelope and rise this far (relative to the median) above its surroundings
+SYLLABLE_MIN_SPACING_SECONDS = 0.1
+SYLLABLE_PROMINENCE_RATIO = 0.3
+TEMPO_WINDOW_FRAMES = 320  # ~10 s of frame energies at 16 kHz / 512 hop
+TEMPO_MIN_FRAMES = 64  # ~2 s before the first estimate
+TEMPO_UPDATE_INTERVAL = 5  # Re-estimate every N analysed chunks
+
+# analyze_full_clip runs the frame statistics over blocks of this length
+FULL_CLIP_BLOCK_SECONDS = 30
+
+# Emotion dimensions as one affine map over the normalized feature vector
+#   [pitch_norm, energy_norm, tempo_norm, stability, min(energy_norm, 1), |pitch_norm|, |tempo_norm|]
+# Rows: arousal, valence, confidence (calmness depends on clipped arousal, computed after)
+EMOTION_WEIGHTS = np.array([
+    [0.4, 0.3, 0.3, 0.0, 0.0, 0.0, 0.0],    # Arousal: pitch, energy, tempo
+    [0.0, 0.0, 0.0, 0.5, 0.3, -0.2, 0.0],   # Valence: stability, energy, -|pitch|
+    [0.0, 0.0, 0.0, 0.3, 0.5, 0.0, -0.2],   # Confidence: stability, energy, (1 - |tempo|)
+])
+EMOTION_BIAS = np.array([0.0, 0.0, 0.2])
+EMOTION_LOWER = np.array([-1.0, -1.0, 0.0])
+EMOTION_UPPER = np.array([1.0, 1.0, 1.0])
+
+def _label_emotion(arousal: float, valence: float) -> str:
+    """Primary emotion label rules over (arousal, valence)"""
+    if arousal > 0.3 and valence > 0.2:
+        emotion = "confident"
+    elif arousal > 0.5 and valence < 0:
+        emotion = "nervous"
+    elif arousal > 0.5 and valence > 0:
+        emotion = "excited"
+    elif arousal < -0.3:
+        if valence > 0:
+            emotion = "calm"
+        else:
+            emotion = "tired"
+    elif abs(arousal) < 0.3 and abs(valence) < 0.3:
+        emotion = "neutral"
+    else:
+        emotion = "neutral"
+    return emotion
+
+# The label rules only use thresholds on a 0.1 grid, so evaluating them once at
+# the centre of each 0.1 x 0.1 cell of [-1, 1]^2 turns classification into a lookup
+EMOTION_GRID_SIZE = 21
+EMOTION_LABELS = ("neutral", "confident", "nervous", "excited", "calm", "tired")
+
+def _grid_index(value: float) -> int:
+    return min(int((value + 1.0) * 10.0), EMOTION_GRID_SIZE - 1)
+
+def _build_emotion_label_grid() -> np.ndarray:
+    centres = (np.arange(EMOTION_GRID_SIZE) + 0.5) / 10.0 - 1.0
+    grid = np.empty((EMOTION_GRID_SIZE, EMOTION_GRID_SIZE), dtype=np.uint8)
+    for i, arousal in enumerate(centres):
+        for j, valence in enumerate(centres):
+            grid[i, j] = EMOTION_LABELS.index(_label_emotion(arousal, valence))
+    return grid
+
+EMOTION_LABEL_GRID = _build_emotion_label_grid()
+
+def _pitch_noise_floor(n_fft: int) -> float:
+    """Band peak power of a PITCH_MIN_AMPLITUDE sine under an n_fft-point Hann window"""
+    return (PITCH_MIN_AMPLITUDE * n_fft / 4.0) ** 2
+
+def _extract_core(frames, power, freqs, k_lo, k_hi, bin_hz, noise_floor, rms_out):
+    """
+    Single pass over every frame computing RMS (written to rms_out), zero-crossing
+    rate, spectral centroid and the parabolic-interpolated band peak pitch.
+    Means/stds use Welford's online update.
+    
+    Returns:
+        (n_voiced, mean_pitch, pitch_std, mean_rms, rms_std, mean_zcr, mean_centroid)
+    """
+    n_frames, frame_length = frames.shape
+    n_bins = power.shape[1]
+    
+    n_voiced = 0
+    pitch_mean = 0.0
+    pitch_m2 = 0.0
+    rms_mean = 0.0
+    rms_m2 = 0.0
+    zcr_sum = 0.0
+    centroid_sum = 0.0
+    
+    for i in range(n_frames):
+        # Time domain: energy and sign changes
+        energy = 0.0
+        crossings = 0
+        previous_negative = frames[i, 0] < 0
+        for j in range(frame_length):
+            x = frames[i, j]
+            energy += x * x
+            negative = x < 0
+            if negative != previous_negative:
+                crossings += 1
+            previous_negative = negative
+        
+        rms = math.sqrt(energy / frame_length)
+        rms_out[i] = rms
+        delta = rms - rms_mean
+        rms_mean += delta / (i + 1)
+        rms_m2 += delta * (rms - rms_mean)
+        zcr_sum += crossings / (frame_length - 1)
+        
+        # Frequency domain: centroid over all bins, peak inside the pitch band
+        magnitude_sum = 0.0
+        weighted_sum = 0.0
+        for k in range(n_bins):
+            magnitude = math.sqrt(power[i, k])
+            magnitude_sum += magnitude
+            weighted_sum += magnitude * freqs[k]
+        if magnitude_sum > 0:
+            centroid_sum += weighted_sum / magnitude_sum
+        
+        peak_bin = k_lo
+        peak = power[i, k_lo]
+        for k in range(k_lo + 1, k_hi):
+            if power[i, k] > peak:
+                peak = power[i, k]
+                peak_bin = k
+        
+        if peak > noise_floor:
+            left = power[i, peak_bin - 1]
+            right = power[i, peak_bin + 1]
+            denominator = left - 2.0 * peak + right
+            offset = 0.5 * (left - right) / denominator if denominator != 0 else 0.0
+            pitch = (peak_bin + offset) * bin_hz
+            
+            n_voiced += 1
+            delta = pitch - pitch_mean
+            pitch_mean += delta / n_voiced
+            pitch_m2 += delta * (pitch - pitch_mean)
+    
+    pitch_std = math.sqrt(pitch_m2 / n_voiced) if n_voiced > 0 else 0.0
+    return (n_voiced, pitch_mean, pitch_std, rms_mean, math.sqrt(rms_m2 / n_frames),
+            zcr_sum / n_frames, centroid_sum / n_frames)
+
+if NUMBA_AVAILABLE:
+    _extract_core = njit(cache=True, fastmath=True, boundscheck=False)(_extract_core)
+
 class SpeechEmotionRecognizer:
     """
     Analyzes speech characteristics to detect emotional state from voice
@@ -35,16 +218,40 @@ class SpeechEmotionRecognizer:
     
     def __init__(self):
         self.sample_rate = 16000  # Standard for speech
-        self.pitch_history = []  # For stability analysis
-        self.energy_history = []
         self.max_history = 20  # Keep last 20 samples
         
-    def analyze_audio_chunk(self, audio_data: bytes) -> Optional[Dict]:
+        # Ring buffers for stability analysis (order is irrelevant for mean/std)
+        self._pitch_buf = np.zeros(self.max_history, dtype=np.float64)
+        self._energy_buf = np.zeros(self.max_history, dtype=np.float64)
+        self._hist_idx = 0
+        self._hist_len = 0
+        
+        # Analysis window and bin frequencies per FFT length (full-length frames
+        # up front; single-frame chunk lengths are added on first use) and
+        # frame-index ranges per frame count
+        self._spectral_grids = {FRAME_LENGTH: self._build_spectral_grid(FRAME_LENGTH)}
+        self._arange_cache = {}
+        
+        # Scratch buffers sized for SCRATCH_SECONDS of audio, reused across chunks
+        max_frames = (SCRATCH_SECONDS * self.sample_rate - FRAME_LENGTH) // HOP_LENGTH + 1
+        self._scratch = np.empty((max_frames, FRAME_LENGTH), dtype=np.float32)
+        self._rms_scratch = np.empty(max_frames, dtype=np.float64)
+        
+        # Per-frame RMS envelope across chunks for the speaking rate estimate
+        self._energy_envelope = deque(maxlen=TEMPO_WINDOW_FRAMES)
+        self._chunks_since_tempo = 0
+        self._last_tempo = DEFAULT_TEMPO
+        
+    def analyze_audio_chunk(self, audio_data: Union[bytes, np.ndarray],
+                            new_samples: Optional[int] = None) -> Optional[Dict]:
         """
         Analyze audio chunk for speech emotion characteristics
         
         Args:
-            audio_data: Raw audio bytes (PCM 16-bit)
+            audio_data: Raw audio bytes (PCM 16-bit) or float32 samples in [-1, 1]
+            new_samples: For overlapping (sliding-window) chunks, how many trailing
+                samples were not part of the previous chunk; only those feed the
+                speaking-rate envelope. None treats the whole chunk as new.
             
         Returns:
             Dict with emotion characteristics or None if analysis fails
@@ -53,16 +260,18 @@ class SpeechEmotionRecognizer:
             return self._mock_analysis()
             
         try:
-            # Convert bytes to numpy array
-            audio_array = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-            audio_array = audio_array / 32768.0  # Normalize to [-1, 1]
+            if isinstance(audio_data, np.ndarray) and audio_data.dtype == np.float32:
+                audio_array = audio_data
+            else:
+                # Convert bytes to numpy array normalized to [-1, 1] (cast + scale in one pass)
+                audio_array = np.multiply(np.frombuffer(audio_data, dtype=np.int16), PCM16_SCALE, dtype=np.float32)
             
             # Skip if too short or silent
             if len(audio_array) < 1600:  # At least 0.1 seconds
                 return None
                 
             # Extract features
-            features = self._extract_features(audio_array)
+            features = self._extract_features(audio_array, new_samples)
             
             if features is None:
                 return None
@@ -79,47 +288,71 @@ class SpeechEmotionRecognizer:
             logger.error(f"Error analyzing audio chunk: {e}")
             return None
     
-    def _extract_features(self, audio: np.ndarray) -> Optional[Dict]:
-        """Extract acoustic features from audio"""
+    def _extract_features(self, audio: np.ndarray, new_samples: Optional[int] = None) -> Optional[Dict]:
+        """Extract acoustic features from audio (new_samples: see analyze_audio_chunk)"""
         try:
-            # 1. Pitch (F0) - fundamental frequency
-            pitches, magnitudes = librosa.piptrack(
-                y=audio,
-                sr=self.sample_rate,
-                fmin=80,   # Male voice lower bound
-                fmax=400   # Female voice upper bound
-            )
-            
-            # Get dominant pitch
-            pitch_values = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:  # Valid pitch
-                    pitch_values.append(pitch)
-            
-            if len(pitch_values) == 0:
-                return None
-                
-            mean_pitch = np.mean(pitch_values)
-            pitch_std = np.std(pitch_values)
+            # Frame once and share one power spectrum between all features
+            # Short chunks are analysed as a single frame
+            if len(audio) < SINGLE_FRAME_MAX_SAMPLES:
+                frames = audio[np.newaxis, :]
+            else:
+                frames = sliding_window_view(audio, FRAME_LENGTH)[::HOP_LENGTH]
             
-            # 2. Energy/Intensity
-            rms_energy = librosa.feature.rms(y=audio)[0]
-            mean_energy = np.mean(rms_energy)
-            energy_std = np.std(rms_energy)
+            n_frames, n_fft = frames.shape
+            window, freqs = self._spectral_grid(n_fft)
             
-            # 3. Zero Crossing Rate (indicates voice quality/tension)
-            zcr = librosa.feature.zero_crossing_rate(audio)[0]
-            mean_zcr = np.mean(zcr)
+            if n_fft == FRAME_LENGTH and n_frames <= len(self._scratch):
+                windowed = np.multiply(frames, window, out=self._scratch[:n_frames])
+            else:
+                windowed = frames * window
+            # pocketfft splits the per-frame transforms across all cores
+            spectrum = rfft(windowed, axis=1, workers=-1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
             
-            # 4. Spectral features (voice quality)
-            spectral_centroid = librosa.feature.spectral_centroid(y=audio, sr=self.sample_rate)[0]
-            mean_spectral = np.mean(spectral_centroid)
+            if NUMBA_AVAILABLE:
+                # Pitch, energy, ZCR and centroid statistics in one compiled pass
+                k_lo, k_hi = self._pitch_band(n_fft, power.shape[1])
+                rms_energy = (self._rms_scratch[:n_frames] if n_frames <= len(self._rms_scratch)
+                              else np.empty(n_frames, dtype=np.float64))
+                (n_voiced, mean_pitch, pitch_std, mean_energy, energy_std,
+                 mean_zcr, mean_spectral) = _extract_core(
+                    frames, power, freqs, k_lo, k_hi, self.sample_rate / n_fft,
+                    _pitch_noise_floor(n_fft), rms_energy
+                )
+                if n_voiced == 0:
+                    return None
+            else:
+                # 1. Pitch (F0) - fundamental frequency
+                pitch = self._estimate_pitch(power, n_fft)
+                if pitch is None:
+                    return None
+                mean_pitch, pitch_std = pitch
+                
+                # 2. Energy/Intensity
+                rms_energy = np.sqrt(np.mean(frames ** 2, axis=1))
+                mean_energy = np.mean(rms_energy)
+                energy_std = np.std(rms_energy)
+                
+                # 3. Zero Crossing Rate (indicates voice quality/tension)
+                signs = np.signbit(frames)
+                zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+                mean_zcr = np.mean(zcr)
+                
+                # 4. Spectral features (voice quality): magnitude-weighted mean frequency
+                magnitude = np.sqrt(power)
+                magnitude_sum = magnitude.sum(axis=1)
+                spectral_centroid = np.divide(magnitude @ freqs, magnitude_sum,
+                                              out=np.zeros_like(magnitude_sum), where=magnitude_sum > 0)
+                mean_spectral = np.mean(spectral_centroid)
             
-            # 5. Speaking rate (tempo)
-            onset_env = librosa.onset.onset_strength(y=audio, sr=self.sample_rate)
-            tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=self.sample_rate)[0]
+            # 5. Speaking rate (tempo), refreshed periodically from the energy envelope
+            # (single-frame chunks don't fit the hop-spaced envelope; keep the cached value).
+            # Frames overlapping the previous chunk are already in the envelope.
+            n_new = n_frames if new_samples is None else min(n_frames, -(-new_samples // HOP_LENGTH))
+            if n_frames > 1 and n_new > 0:
+                tempo = self._update_tempo(rms_energy[n_frames - n_new:])
+            else:
+                tempo = self._last_tempo
             
             return {
                 'mean_pitch': float(mean_pitch),
@@ -135,6 +368,89 @@ class SpeechEmotionRecognizer:
             logger.error(f"Feature extraction failed: {e}")
             return None
     
+    def _build_spectral_grid(self, n_fft: int) -> Tuple[np.ndarray, np.ndarray]:
+        return np.hanning(n_fft).astype(np.float32), np.fft.rfftfreq(n_fft, d=1.0 / self.sample_rate)
+    
+    def _spectral_grid(self, n_fft: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached (Hann window, rfft bin frequencies) for an n_fft-point frame"""
+        grid = self._spectral_grids.get(n_fft)
+        if grid is None:
+            if len(self._spectral_grids) >= SPECTRAL_GRID_CACHE_SIZE:
+                self._spectral_grids = {FRAME_LENGTH: self._spectral_grids[FRAME_LENGTH]}
+            grid = self._spectral_grids[n_fft] = self._build_spectral_grid(n_fft)
+        return grid
+    
+    def _frame_indices(self, n_frames: int) -> np.ndarray:
+        indices = self._arange_cache.get(n_frames)
+        if indices is None:
+            indices = self._arange_cache[n_frames] = np.arange(n_frames)
+        return indices
+    
+    def _update_tempo(self, rms_energy: np.ndarray) -> float:
+        """
+        Append this chunk's frame energies to the rolling envelope and, every
+        TEMPO_UPDATE_INTERVAL chunks, re-estimate the speaking rate as energy
+        peaks (roughly syllable nuclei) per minute. Returns the cached estimate.
+        """
+        self._energy_envelope.extend(rms_energy.tolist())
+        self._chunks_since_tempo += 1
+        
+        if (self._chunks_since_tempo >= TEMPO_UPDATE_INTERVAL
+                and len(self._energy_envelope) >= TEMPO_MIN_FRAMES):
+            self._chunks_since_tempo = 0
+            envelope = np.fromiter(self._energy_envelope, dtype=np.float64, count=len(self._energy_envelope))
+            self._last_tempo = self._speaking_rate(envelope)
+        
+        return self._last_tempo
+    
+    def _speaking_rate(self, envelope: np.ndarray) -> float:
+        """Energy peaks (roughly syllable nuclei) per minute of a hop-spaced RMS envelope"""
+        median = np.median(envelope)
+        min_spacing = max(int(round(SYLLABLE_MIN_SPACING_SECONDS * self.sample_rate / HOP_LENGTH)), 1)
+        peaks, _ = find_peaks(envelope, height=median, distance=min_spacing,
+                              prominence=median * SYLLABLE_PROMINENCE_RATIO)
+        elapsed_seconds = len(envelope) * HOP_LENGTH / self.sample_rate
+        return len(peaks) * 60.0 / elapsed_seconds
+    
+    def _pitch_band(self, n_fft: int, n_bins: int) -> Tuple[int, int]:
+        """FFT bin range [k_lo, k_hi) covering PITCH_FMIN..PITCH_FMAX"""
+        # Keep one bin of margin on both sides for the interpolation
+        k_lo = max(int(np.ceil(PITCH_FMIN * n_fft / self.sample_rate)), 1)
+        k_hi = min(int(PITCH_FMAX * n_fft / self.sample_rate) + 1, n_bins - 1)
+        return k_lo, k_hi
+    
+    def _estimate_pitch(self, power: np.ndarray, n_fft: int) -> Optional[Tuple[float, float]]:
+        """
+        Dominant F0 per frame from the strongest FFT bin in PITCH_FMIN..PITCH_FMAX,
+        refined with 3-point parabolic interpolation.
+        
+        Args:
+            power: (n_frames, n_fft // 2 + 1) power spectrum of the Hann-windowed frames
+            n_fft: Frame length used for the FFT
+        
+        Returns:
+            (mean_pitch, pitch_std) in Hz over voiced frames, or None if every frame's
+            band peak is below the noise floor
+        """
+        k_lo, k_hi = self._pitch_band(n_fft, power.shape[1])
+        
+        # Peak bin of every frame at once (no per-frame Python loop)
+        rows = self._frame_indices(power.shape[0])
+        peak_bins = k_lo + power[:, k_lo:k_hi].argmax(axis=1)
+        peak = power[rows, peak_bins]
+        left = power[rows, peak_bins - 1]
+        right = power[rows, peak_bins + 1]
+        
+        denominator = left - 2.0 * peak + right
+        offset = np.divide(0.5 * (left - right), denominator,
+                           out=np.zeros_like(peak), where=denominator != 0)
+        pitches = (peak_bins + offset) * (self.sample_rate / n_fft)
+        
+        voiced = pitches[peak > _pitch_noise_floor(n_fft)]
+        if voiced.size == 0:
+            return None
+        return float(voiced.mean()), float(voiced.std())
+    
     def _classify_emotion(self, features: Dict) -> Dict:
         """
         Classify emotional state based on acoustic features
@@ -157,60 +473,31 @@ class SpeechEmotionRecognizer:
         pitch_norm = (pitch - 150) / 100  # Normalize around 150Hz
         pitch_var_norm = pitch_var / 30
         energy_norm = energy / 0.05
-        tempo_norm = (tempo - 120) / 30  # Normalize around 120 BPM
-        
-        # Calculate emotion dimensions
+        tempo_norm = (tempo - SPEAKING_RATE_BASELINE) / SPEAKING_RATE_SCALE  # Syllables/min around ~4/s
         
-        # 1. Arousal (high = excited/nervous, low = calm/tired)
-        arousal = (
-            0.4 * pitch_norm +
-            0.3 * energy_norm +
-            0.3 * tempo_norm
-        )
-        arousal = np.clip(arousal, -1, 1)
-        
-        # 2. Valence (positive = happy/confident, negative = sad/stressed)
-        # Stable pitch + moderate energy = positive
-        # High variation + extreme values = negative
+        # Calculate emotion dimensions (see EMOTION_WEIGHTS)
+        # - Arousal (high = excited/nervous, low = calm/tired)
+        # - Valence (positive = happy/confident, negative = sad/stressed):
+        #   stable pitch + moderate energy = positive, high variation + extreme values = negative
+        # - Confidence (high = assertive, low = hesitant)
         stability = 1.0 - min(pitch_var_norm, 1.0)
-        valence = (
-            0.5 * stability +
-            0.3 * min(energy_norm, 1.0) -
-            0.2 * abs(pitch_norm)
-        )
-        valence = np.clip(valence, -1, 1)
-        
-        # 3. Confidence (high = assertive, low = hesitant)
-        confidence = (
-            0.5 * min(energy_norm, 1.0) +
-            0.3 * stability +
-            0.2 * (1.0 - abs(tempo_norm))
+        normalized = np.array([
+            pitch_norm, energy_norm, tempo_norm, stability,
+            min(energy_norm, 1.0), abs(pitch_norm), abs(tempo_norm)
+        ])
+        arousal, valence, confidence = np.clip(
+            EMOTION_WEIGHTS @ normalized + EMOTION_BIAS, EMOTION_LOWER, EMOTION_UPPER
         )
-        confidence = np.clip(confidence, 0, 1)
         
-        # 4. Calmness (inverse of arousal + stability)
+        # Calmness (inverse of arousal + stability)
         calmness = (
             0.6 * (1.0 - abs(arousal)) +
             0.4 * stability
         )
         calmness = np.clip(calmness, 0, 1)
         
-        # Determine primary emotion label
-        if arousal > 0.3 and valence > 0.2:
-            emotion = "confident"
-        elif arousal > 0.5 and valence < 0:
-            emotion = "nervous"
-        elif arousal > 0.5 and valence > 0:
-            emotion = "excited"
-        elif arousal < -0.3:
-            if valence > 0:
-                emotion = "calm"
-            else:
-                emotion = "tired"
-        elif abs(arousal) < 0.3 and abs(valence) < 0.3:
-            emotion = "neutral"
-        else:
-            emotion = "neutral"
+        # Determine primary emotion label (precomputed grid, see _label_emotion)
+        emotion = EMOTION_LABELS[EMOTION_LABEL_GRID[_grid_index(arousal), _grid_index(valence)]]
         
         return {
             'speech_emotion': emotion,
@@ -227,15 +514,11 @@ class SpeechEmotionRecognizer:
         }
     
     def _update_history(self, features: Dict):
-        """Update feature history for trend analysis"""
-        self.pitch_history.append(features['mean_pitch'])
-        self.energy_history.append(features['mean_energy'])
-        
-        # Keep only recent history
-        if len(self.pitch_history) > self.max_history:
-            self.pitch_history.pop(0)
-        if len(self.energy_history) > self.max_history:
-            self.energy_history.pop(0)
+        """Update feature history for trend analysis (overwrites the oldest entry when full)"""
+        self._pitch_buf[self._hist_idx] = features['mean_pitch']
+        self._energy_buf[self._hist_idx] = features['mean_energy']
+        self._hist_idx = (self._hist_idx + 1) % self.max_history
+        self._hist_len = min(self._hist_len + 1, self.max_history)
     
     def get_stability_score(self) -> float:
         """
@@ -244,12 +527,14 @@ class SpeechEmotionRecognizer:
         Returns:
             Float 0-1 where 1 = very stable, 0 = highly variable
         """
-        if len(self.pitch_history) < 5:
+        if self._hist_len < 5:
             return 0.5  # Neutral if not enough data
         
         # Calculate coefficient of variation (lower = more stable)
-        pitch_cv = np.std(self.pitch_history) / (np.mean(self.pitch_history) + 1e-6)
-        energy_cv = np.std(self.energy_history) / (np.mean(self.energy_history) + 1e-6)
+        pitch_history = self._pitch_buf[:self._hist_len]
+        energy_history = self._energy_buf[:self._hist_len]
+        pitch_cv = pitch_history.std() / (pitch_history.mean() + 1e-6)
+        energy_cv = energy_history.std() / (energy_history.mean() + 1e-6)
         
         # Convert to stability score (inverse of variation)
         pitch_stability = 1.0 / (1.0 + pitch_cv * 5)  # Scale factor
@@ -260,6 +545,87 @@ class SpeechEmotionRecognizer:
         
         return float(np.clip(overall_stability, 0, 1))
     
+    def analyze_full_clip(self, audio: np.ndarray, sr: int) -> Optional[Dict]:
+        """
+        Offline analysis of a whole recording (e.g. an uploaded file).
+        
+        Uses WORLD's DIO + StoneMask F0 tracker when pyworld is installed (much
+        faster than PYIN-style trackers on long clips), otherwise the FFT peak
+        estimator. Does not touch the streaming history/tempo state; use
+        analyze_audio_chunk for real-time chunks.
+        """
+        if not AUDIO_LIBS_AVAILABLE:
+            return self._mock_analysis()
+        
+        try:
+            if audio.dtype == np.int16:
+                audio = np.multiply(audio, PCM16_SCALE, dtype=np.float32)
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+            
+            # Frame statistics run at the streaming sample rate
+            clip = audio
+            if sr != self.sample_rate:
+                target_length = int(len(audio) * self.sample_rate / sr)
+                clip = np.interp(
+                    np.linspace(0, len(audio) - 1, target_length), np.arange(len(audio)), audio
+                ).astype(np.float32)
+            if len(clip) < SINGLE_FRAME_MAX_SAMPLES:
+                return None
+            
+            # Per-block statistics on a scratch recognizer, pooled by frame count
+            scratch = SpeechEmotionRecognizer()
+            block = FULL_CLIP_BLOCK_SECONDS * self.sample_rate
+            blocks = []
+            for start in range(0, len(clip), block):
+                samples = clip[start:start + block]
+                if len(samples) < SINGLE_FRAME_MAX_SAMPLES:
+                    break
+                features = scratch._extract_features(samples)
+                if features is not None:
+                    blocks.append(((len(samples) - FRAME_LENGTH) // HOP_LENGTH + 1, features))
+            if not blocks:
+                return None
+            
+            weights = np.array([count for count, _ in blocks], dtype=np.float64)
+            weights /= weights.sum()
+            
+            def pooled(mean_key: str, std_key: Optional[str] = None):
+                means = np.array([features[mean_key] for _, features in blocks])
+                mean = float(weights @ means)
+                if std_key is None:
+                    return mean
+                stds = np.array([features[std_key] for _, features in blocks])
+                return mean, float(np.sqrt(max(weights @ (stds ** 2 + means ** 2) - mean ** 2, 0.0)))
+            
+            mean_pitch, pitch_std = pooled('mean_pitch', 'pitch_std')
+            mean_energy, energy_std = pooled('mean_energy', 'energy_std')
+            
+            # Speaking rate over the whole clip's RMS envelope
+            frames = sliding_window_view(clip, FRAME_LENGTH)[::HOP_LENGTH]
+            envelope = np.sqrt(np.einsum('ij,ij->i', frames, frames, dtype=np.float64) / FRAME_LENGTH)
+            
+            if PYWORLD_AVAILABLE:
+                x = audio.astype(np.float64)
+                f0, times = pyworld.dio(x, sr, f0_floor=PITCH_FMIN, f0_ceil=PITCH_FMAX, frame_period=10.0)
+                f0 = pyworld.stonemask(x, f0, times, sr)
+                voiced = f0[f0 > 0]
+                if voiced.size:
+                    mean_pitch, pitch_std = float(voiced.mean()), float(voiced.std())
+            
+            return self._classify_emotion({
+                'mean_pitch': mean_pitch,
+                'pitch_std': pitch_std,
+                'mean_energy': mean_energy,
+                'energy_std': energy_std,
+                'mean_zcr': pooled('mean_zcr'),
+                'mean_spectral': pooled('mean_spectral'),
+                'tempo': self._speaking_rate(envelope)
+            })
+            
+        except Exception as e:
+            logger.error(f"Error analyzing full clip: {e}")
+            return None
+    
     def _mock_analysis(self) -> Dict:
         """Mock analysis when libraries not available"""
         logger.warning("Using mock speech emotion analysis (libraries not installed)")
@@ -273,16 +639,6 @@ class SpeechEmotionRecognizer:
                 'pitch_hz': 150.0,
                 'pitch_variation': 20.0,
                 'energy_level': 0.05,
-                'speaking_rate': 120.0
+                'speaking_rate': DEFAULT_TEMPO
             }
         }
-
-# Singleton instance
-_recognizer_instance = None
-
-def get_speech_emotion_recognizer() -> SpeechEmotionRecognizer:
-    """Get singleton instance of speech emotion recognizer"""
-    global _recognizer_instance
-    if _recognizer_instance is None:
-        _recognizer_instance = SpeechEmotionRecognizer()
-    return _recognizer_instance
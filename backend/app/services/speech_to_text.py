@@ -1,12 +1,33 @@
+import asyncio
 import os
-import tempfile
+import threading
 import numpy as np
 from faster_whisper import WhisperModel
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# faster-whisper takes raw float32 mono audio at this rate without decoding a file
+WHISPER_SAMPLE_RATE = 16000
+PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+# VAD settings for the streaming path
+STREAM_VAD_MIN_SILENCE_MS = 300
+STREAM_VAD_SPEECH_PAD_MS = 100
+
+# Micro-batching for transcribe_audio_stream_async
+MICRO_BATCH_INTERVAL = 0.1  # Seconds to collect chunks before one Whisper call
+# Silence inserted between concatenated chunks: well above min silence + both speech
+# pads, so VAD always cuts at a gap and no speech span joins two callers' chunks
+MICRO_BATCH_GAP_SECONDS = 2 * (STREAM_VAD_MIN_SILENCE_MS + 2 * STREAM_VAD_SPEECH_PAD_MS) / 1000
+MICRO_BATCH_MAX_SECONDS = 30.0  # One Whisper window
+
+# Loaded models shared by every SpeechToTextService, keyed by (size, device, compute_type).
+# CTranslate2 models are thread-safe, so concurrent callers can share one instance.
+_MODELS: Dict[tuple, WhisperModel] = {}
+_MODELS_LOCK = threading.Lock()
+
 class SpeechToTextService:
     def __init__(self, model_size: str = "base", device: str = "cuda", language: str = "id"):
         self.model_size = model_size
@@ -19,15 +40,53 @@ class SpeechToTextService:
         self.language = language
         self.model = None
         
+        # Queue of (audio, future) waiting for the micro-batch worker
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._batch_task: Optional[asyncio.Task] = None
+        
+        # Built once and passed by reference on every streaming call
+        self._vad_options = dict(min_silence_duration_ms=STREAM_VAD_MIN_SILENCE_MS,
+                                 speech_pad_ms=STREAM_VAD_SPEECH_PAD_MS)
+        
+        # Chunks below these levels are treated as silence / room noise and skip Whisper
+        self.silence_rms_threshold = 0.005
+        self.noise_rms_threshold = 0.01
+        self.noise_zcr_threshold = 0.3
+        
     def initialize(self):
         if self.model is None:
-            logger.info(f"Loading Whisper model: {self.model_size}")
-            self.model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type="int8" if self.device == "cpu" else "float16"
+            # int8 weights everywhere: int8_float16 on GPU halves weight bandwidth
+            # vs float16; on CPU use half the cores for CTranslate2 intra-op threads.
+            # Together with vad_filter this is the fast streaming configuration.
+            compute_type = "int8_float16" if self.device == "cuda" else "int8"
+            key = (self.model_size, self.device, compute_type)
+            
+            with _MODELS_LOCK:
+                model = _MODELS.get(key)
+                if model is None:
+                    logger.info(f"Loading Whisper model: {self.model_size}")
+                    model = WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        device_index=0,
+                        compute_type=compute_type,
+                        cpu_threads=max(1, (os.cpu_count() or 2) // 2),
+                        num_workers=1
+                    )
+                    _MODELS[key] = model
+                    logger.info("Whisper model loaded successfully")
+                    self._prewarm_vad()
+            self.model = model
+    
+    def _prewarm_vad(self):
+        """Load the Silero VAD model up front so the first vad_filter call doesn't pay for it"""
+        try:
+            from faster_whisper.vad import VadOptions, get_speech_timestamps
+            get_speech_timestamps(
+                np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), VadOptions(**self._vad_options)
             )
-            logger.info("Whisper model loaded successfully")
+        except Exception as e:
+            logger.warning(f"[STT] VAD pre-warm skipped: {e}")
     
     def transcribe_audio(self, audio_path: str) -> List[Dict]:
         self.initialize()
@@ -51,59 +110,175 @@ class SpeechToTextService:
         
         return results
     
-    def transcribe_audio_stream(self, audio_data: np.ndarray, sample_rate: int = 16000) -> Tuple[str, float]:
+    def transcribe_audio_stream(self, audio_data: Union[np.ndarray, bytes], sample_rate: int = 16000) -> Tuple[str, float]:
+        """
+        Transcribe a short chunk of mono audio.
+        
+        audio_data may be float32 samples in [-1, 1], int16 PCM samples, or raw
+        PCM16 bytes; integer input is scaled to float32 once, right before use.
+        """
+        audio_data = self._prepare_stream_audio(audio_data, sample_rate)
+        if audio_data is None:
+            return "", 0.0
+        
         self.initialize()
         
-        if len(audio_data) < sample_rate * 0.5:
+        try:
+            return self._transcribe_batch([audio_data])[0]
+        except Exception as e:
+            logger.error(f"[STT] Error: {e}")
             return "", 0.0
+    
+    async def transcribe_audio_stream_async(self, audio_data: Union[np.ndarray, bytes], sample_rate: int = 16000) -> Tuple[str, float]:
+        """
+        Async variant of transcribe_audio_stream for concurrent streams.
         
-        import soundfile as sf
+        Chunks queued within MICRO_BATCH_INTERVAL seconds are concatenated (with
+        silence gaps) into one Whisper call, then the words are split back to
+        their callers by timestamp.
+        """
+        audio_data = self._prepare_stream_audio(audio_data, sample_rate)
+        if audio_data is None:
+            return "", 0.0
         
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-            temp_path = temp_file.name
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((audio_data, future))
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_task = loop.create_task(self._batch_worker())
+        return await future
+    
+    async def _batch_worker(self):
+        while self._pending:
+            await asyncio.sleep(MICRO_BATCH_INTERVAL)
+            
+            # Take queued chunks up to one Whisper window (30 s) of audio
+            batch, total = [], 0
+            max_samples = int(MICRO_BATCH_MAX_SECONDS * WHISPER_SAMPLE_RATE)
+            while self._pending and (not batch or total + len(self._pending[0][0]) <= max_samples):
+                audio_data, future = self._pending.pop(0)
+                batch.append((audio_data, future))
+                total += len(audio_data) + int(MICRO_BATCH_GAP_SECONDS * WHISPER_SAMPLE_RATE)
+            
             try:
-                sf.write(temp_path, audio_data, sample_rate)
+                await asyncio.to_thread(self.initialize)
+                results = await asyncio.to_thread(self._transcribe_batch, [audio for audio, _ in batch])
             except Exception as e:
-                logger.error(f"[STT] Error writing audio file: {e}")
-                return "", 0.0
-        
-        try:
-            # Fast transcription with minimal options
-            segments, info = self.model.transcribe(
-                temp_path,
-                language=self.language,
-                beam_size=1,  # Reduced from 5 for speed
-                vad_filter=True,  # Enable VAD for better accuracy
-                condition_on_previous_text=False,  # Faster processing
-                temperature=0.0  # Deterministic output
-            )
+                logger.error(f"[STT] Batch error: {e}")
+                results = [("", 0.0)] * len(batch)
             
-            text = ""
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+    
+    def _prepare_stream_audio(self, audio_data: Union[np.ndarray, bytes], sample_rate: int):
+        """float32 mono at WHISPER_SAMPLE_RATE, or None if the chunk is too short or silent"""
+        if isinstance(audio_data, (bytes, bytearray, memoryview)):
+            audio_data = np.frombuffer(audio_data, dtype=np.int16)
+        
+        if len(audio_data) < sample_rate * 0.5:
+            return None
+        
+        # Pass the samples straight to the model (no temp WAV write/read)
+        if audio_data.dtype == np.int16:
+            audio_data = np.multiply(audio_data, PCM16_SCALE, dtype=np.float32)
+        else:
+            audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
+        
+        if self._is_silence(audio_data):
+            return None
+        
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            target_length = int(len(audio_data) * WHISPER_SAMPLE_RATE / sample_rate)
+            audio_data = np.interp(
+                np.linspace(0, len(audio_data) - 1, target_length),
+                np.arange(len(audio_data)),
+                audio_data
+            ).astype(np.float32)
+        return audio_data
+    
+    def _transcribe_batch(self, chunks: List[np.ndarray]) -> List[Tuple[str, float]]:
+        """
+        Run Whisper once over all chunks joined by MICRO_BATCH_GAP_SECONDS of silence
+        and return (text, confidence) per chunk. With several chunks, words are
+        split back to their chunk by word timestamp, so a segment that still
+        straddles a gap can't move one caller's words to another.
+        """
+        if len(chunks) == 1:
+            audio_data = chunks[0]
+            bounds = [(0.0, len(audio_data) / WHISPER_SAMPLE_RATE)]
+        else:
+            gap = np.zeros(int(MICRO_BATCH_GAP_SECONDS * WHISPER_SAMPLE_RATE), dtype=np.float32)
+            parts, bounds, offset = [], [], 0
+            for chunk in chunks:
+                parts.extend((chunk, gap))
+                bounds.append((offset / WHISPER_SAMPLE_RATE, (offset + len(chunk)) / WHISPER_SAMPLE_RATE))
+                offset += len(chunk) + len(gap)
+            audio_data = np.concatenate(parts[:-1])
+        
+        # Fast transcription with minimal options
+        split_words = len(chunks) > 1
+        segments, info = self.model.transcribe(
+            audio_data,
+            language=self.language,
+            beam_size=1,  # Reduced from 5 for speed
+            vad_filter=True,  # Enable VAD for better accuracy
+            vad_parameters=self._vad_options,
+            condition_on_previous_text=False,  # Faster processing
+            temperature=0.0,  # Deterministic output
+            word_timestamps=split_words  # Only needed to split a batch back per chunk
+        )
+        
+        texts = [[] for _ in chunks]
+        logprob_sums = [0.0] * len(chunks)
+        segment_counts = [0] * len(chunks)
+        
+        def chunk_index(start: float, end: float) -> int:
+            midpoint = (start + end) / 2
+            return next((i for i, (_, chunk_end) in enumerate(bounds) if midpoint < chunk_end), len(bounds) - 1)
+        
+        for segment in segments:
+            if not segment.text.strip():  # Only add non-empty segments
+                continue
+            if split_words and segment.words:
+                # Each word goes to the chunk containing its midpoint
+                touched = set()
+                for word in segment.words:
+                    index = chunk_index(word.start, word.end)
+                    texts[index].append(word.word)
+                    touched.add(index)
+            else:
+                index = chunk_index(segment.start, segment.end)
+                texts[index].append(" " + segment.text.strip())
+                touched = {index}
+            for index in touched:
+                logprob_sums[index] += segment.avg_logprob
+                segment_counts[index] += 1
+        
+        results = []
+        for chunk_words, logprob_sum, count in zip(texts, logprob_sums, segment_counts):
+            text = "".join(chunk_words).strip()
             avg_confidence = 0.0
-            count = 0
-            
-            for segment in segments:
-                segment_text = segment.text.strip()
-                if segment_text:  # Only add non-empty segments
-                    text += segment_text + " "
-                    avg_confidence += segment.avg_logprob
-                    count += 1
-            
-            if count > 0:
-                avg_confidence /= count
+            if text:
+                avg_confidence = logprob_sum / count
                 avg_confidence = max(0.0, min(1.0, (avg_confidence + 5) / 5))
-            
-            result_text = text.strip()
-            return result_text, float(avg_confidence)
-        except Exception as e:
-            logger.error(f"[STT] Error: {e}")
-            return "", 0.0
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            results.append((" ".join(text.split()), float(avg_confidence)))
+        return results
+    
+    def _is_silence(self, audio_data: np.ndarray) -> bool:
+        """Cheap RMS / zero-crossing check so silent or noise-only chunks never reach Whisper"""
+        rms = float(np.sqrt(np.mean(np.square(audio_data))))
+        if rms < self.silence_rms_threshold:
+            return True
+        if rms < self.noise_rms_threshold:
+            # Quiet, high zero-crossing content is hiss rather than voiced speech
+            signs = np.signbit(audio_data)
+            zcr = float(np.count_nonzero(signs[1:] != signs[:-1])) / (len(audio_data) - 1)
+            return zcr > self.noise_zcr_threshold
+        return False
     
     def cleanup(self):
+        # The model itself is shared (see _MODELS); only drop this instance's reference
         if self.model is not None:
-            del self.model
             self.model = None
-            logger.info("Whisper model cleaned up")
+            logger.info("Whisper model released")
@@ -3,8 +3,14 @@ from typing import Dict, List
 import json
 import asyncio
 import base64
+import binascii
+import inspect
 import logging
-from datetime import datetime
+import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +19,7 @@ try:
     from ..services.facial_emotion import FacialEmotionService
     from ..services.speech_emotion import SpeechEmotionService
     from ..services.nlp_analyzer import NLPAnalyzer
-    from ..services.speech_emotion_recognition import get_speech_emotion_recognizer
+    from ..services.speech_emotion_recognition import SpeechEmotionRecognizer
     AI_AVAILABLE = True
     logger.info("Using REAL AI services - All dependencies loaded")
 except ImportError as e:
@@ -25,46 +31,244 @@ except ImportError as e:
         MockNLPAnalyzer as NLPAnalyzer
     )
     # Mock speech emotion recognizer
-    class MockSpeechEmotionRecognizer:
-        def analyze_audio_chunk(self, audio_data):
+    class SpeechEmotionRecognizer:
+        def analyze_audio_chunk(self, audio_data, new_samples=None):
             return None
         def get_stability_score(self):
             return 0.5
-    def get_speech_emotion_recognizer():
-        return MockSpeechEmotionRecognizer()
     AI_AVAILABLE = False
     logger.warning("Using MOCK AI services - AI dependencies not installed")
 
 from ..services.behavioral_scoring import BehavioralScoringEngine
 from ..services.audio_recorder import AudioRecorder
+from ..services.emotion_history import EmotionHistory
 from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.interview import Interview, EmotionLog
 
-# Import numpy & cv2 only if available
+import numpy as np
+
+# Import cv2 only if available
 try:
-    import numpy as np
     import cv2
     CV_AVAILABLE = True
 except ImportError:
     CV_AVAILABLE = False
     logger.warning("OpenCV not available - video frame processing disabled")
 
+# libjpeg-turbo (SIMD Huffman + IDCT) is optional; falls back to cv2.imdecode
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _tj = TurboJPEG()
+    # PyTurboJPEG >= 2.x can decode into a caller-provided array
+    TURBOJPEG_DST = "dst" in inspect.signature(_tj.decode).parameters
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    _tj = None
+    TURBOJPEG_DST = False
+    TURBOJPEG_AVAILABLE = False
+    logger.info("PyTurboJPEG not available - using cv2.imdecode for video frames")
+
+# Face detection needs OpenCV; without it video frames are counted but never analyzed
+VIDEO_ENABLED = CV_AVAILABLE
+if not VIDEO_ENABLED:
+    logger.info("[Video] OpenCV not available - video frames will be skipped")
+
+
+def _decode_frame(frame_data: str, buffers: Dict = None):
+    """
+    Decode a base64 (optionally data-URL prefixed) JPEG frame into a BGR uint8 array.
+    With `buffers`, the frame is decoded into buffers["decode_buf"], reallocated only
+    when the webcam resolution changes.
+    """
+    comma = frame_data.find(',')
+    frame_bytes = binascii.a2b_base64(frame_data[comma + 1:] if comma >= 0 else frame_data)
+    if not TURBOJPEG_AVAILABLE:
+        return cv2.imdecode(np.frombuffer(frame_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if buffers is None or not TURBOJPEG_DST:
+        return _tj.decode(frame_bytes, pixel_format=TJPF_BGR)
+    
+    width, height = _tj.decode_header(frame_bytes)[:2]
+    decode_buf = buffers.get("decode_buf")
+    if decode_buf is None or decode_buf.shape != (height, width, 3):
+        decode_buf = buffers["decode_buf"] = np.empty((height, width, 3), dtype=np.uint8)
+    return _tj.decode(frame_bytes, pixel_format=TJPF_BGR, dst=decode_buf)
+
+
+def _decode_and_detect(frame_data: str, facial_service, buffers: Dict):
+    """Worker-thread part of process_video_frame: decode + face emotion inference"""
+    frame = _decode_frame(frame_data, buffers)
+    if frame is None:
+        return None
+    return facial_service.detect_emotion(frame)
+
+
+# Each interview owns its recognizer (scratch buffers, tempo envelope, history);
+# speech_busy keeps at most one analysis per interview in flight
+def _analyze_speech(speech_recognizer, audio: np.ndarray, new_samples: int):
+    """Worker-thread part of _analyze_speech_emotion"""
+    return speech_recognizer.analyze_audio_chunk(audio, new_samples)
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+EMOTION_HISTORY_SIZE = 100
+
+# Speech emotion runs on the last SPEECH_WINDOW_SECONDS of audio kept in a per-interview ring
+AUDIO_SAMPLE_RATE = 16000
+SPEECH_WINDOW_SECONDS = 2
+PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def _write_audio_ring(state: Dict, audio_int16: np.ndarray):
+    """Scale PCM16 samples straight into the float32 ring (cast + scale + copy in one pass)"""
+    ring = state["audio_ring"]
+    size = len(ring)
+    if len(audio_int16) >= size:
+        audio_int16 = audio_int16[-size:]
+    n = len(audio_int16)
+    pos = state["audio_pos"]
+    first = min(n, size - pos)
+    np.multiply(audio_int16[:first], PCM16_SCALE, out=ring[pos:pos + first])
+    if first < n:
+        np.multiply(audio_int16[first:], PCM16_SCALE, out=ring[:n - first])
+    state["audio_pos"] = (pos + n) % size
+    state["audio_filled"] = min(state["audio_filled"] + n, size)
+    state["audio_new"] = min(state["audio_new"] + n, size)
+
+
+def _read_audio_window(state: Dict) -> np.ndarray:
+    """Copy the ring into the preallocated window buffer in chronological order"""
+    ring, window = state["audio_ring"], state["audio_window"]
+    pos, filled = state["audio_pos"], state["audio_filled"]
+    if filled < len(ring):
+        window[:filled] = ring[:filled]
+    else:
+        tail = len(ring) - pos
+        window[:tail] = ring[pos:]
+        window[tail:] = ring[:pos]
+    return window[:filled]
+
+
+def _pack_scores(emotion_scores):
+    """Encode emotion scores (numpy floats included) to orjson bytes for the BLOB column"""
+    if emotion_scores is None:
+        return None
+    return orjson.dumps(emotion_scores, option=ORJSON_OPTIONS)
+
+
+def _now(state: Dict) -> float:
+    """Epoch seconds from the connection's wall-clock anchor plus the monotonic clock (never goes backwards)"""
+    return state["t0_wall"] + (time.monotonic_ns() - state["t0_mono"]) * 1e-9
+
+
+# Warm FacialEmotionService instances kept for reuse across interviews
+FACIAL_POOL_SIZE = 4
+_facial_pool: List = []
+
+
+def _acquire_facial_service():
+    """Reuse an idle (already initialized) service, or create one if the pool is empty"""
+    return _facial_pool.pop() if _facial_pool else FacialEmotionService()
+
+
+def _release_facial_service(service):
+    service.reset()
+    if len(_facial_pool) < FACIAL_POOL_SIZE:
+        _facial_pool.append(service)
+    else:
+        service.cleanup()
+
+
+# Outbound messages queued per connection; a full queue means the client is not keeping up
+SEND_QUEUE_SIZE = 256
+
+# Background DB writer: rows are flushed every DB_FLUSH_BATCH_SIZE rows or DB_FLUSH_INTERVAL seconds
+DB_QUEUE_SIZE = 1000
+DB_FLUSH_BATCH_SIZE = 128
+DB_FLUSH_INTERVAL = 2.0
+_FLUSH_SENTINEL = object()
+
+
+def _emotion_row(interview_id: int, emotion_data: Dict):
+    """EmotionLog row dict, or None if facial confidence is too low (<= 0.5) to keep"""
+    facial_conf = float(emotion_data.get("facial_confidence", 0))
+    if facial_conf <= 0.5:
+        return None
+    return {
+        "interview_id": interview_id,
+        "timestamp": float(emotion_data["timestamp"]),
+        "facial_emotion": str(emotion_data.get("facial_emotion")),
+        "facial_confidence": facial_conf,
+        "speech_emotion": emotion_data.get("speech_emotion"),
+        "speech_confidence": float(emotion_data["speech_confidence"]) if emotion_data.get("speech_confidence") else None,
+        "emotion_scores": _pack_scores(emotion_data.get("emotion_scores"))
+    }
+
+
+def _write_emotion_rows(rows: List[Dict]):
+    """Runs in a worker thread with its own session (the request session stays on the event loop)"""
+    db = SessionLocal()
+    try:
+        # Single executemany INSERT, skipping per-object unit-of-work bookkeeping
+        db.bulk_insert_mappings(EmotionLog, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[int, WebSocket] = {}
         self.interview_states: Dict[int, Dict] = {}
+        # CPU-bound decode/inference runs here so the event loop stays responsive
+        self._frame_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                                  thread_name_prefix="interview-worker")
     
     async def connect(self, websocket: WebSocket, interview_id: int):
         await websocket.accept()
         self.active_connections[interview_id] = websocket
         self.interview_states[interview_id] = {
-            "emotions": [],
-            "emotion_history": [],
-            "facial_service": FacialEmotionService(),
-            "speech_emotion_recognizer": get_speech_emotion_recognizer(),
+            # Only the recent window is kept in memory; older entries are already queued for the DB
+            "emotions": deque(maxlen=EMOTION_HISTORY_SIZE),
+            "emotion_count": 0,
+            # Timestamp anchors for _now()
+            "t0_wall": time.time(),
+            "t0_mono": time.monotonic_ns(),
+            "emotions_saved": 0,
+            "db_queue": asyncio.Queue(maxsize=DB_QUEUE_SIZE),
+            "emotion_history": EmotionHistory(maxlen=EMOTION_HISTORY_SIZE),
+            "facial_service": _acquire_facial_service(),
+            "speech_emotion_recognizer": SpeechEmotionRecognizer(),
             "audio_recorder": AudioRecorder(interview_id),
             "frame_count": 0,
-            "audio_chunk_count": 0
+            "frame_rate": settings.VIDEO_FRAME_RATE,
+            "audio_chunk_count": 0,
+            # Latest-wins video handoff: the worker always analyzes the freshest pending frame
+            "pending_frame": None,
+            "pending_event": asyncio.Event(),
+            "closing": False,
+            "send_queue": asyncio.Queue(maxsize=SEND_QUEUE_SIZE),
+            "speech_busy": False,
+            "audio_ring": np.zeros(AUDIO_SAMPLE_RATE * SPEECH_WINDOW_SECONDS, dtype=np.float32),
+            "audio_window": np.empty(AUDIO_SAMPLE_RATE * SPEECH_WINDOW_SECONDS, dtype=np.float32),
+            "audio_pos": 0,
+            "audio_filled": 0,
+            # Samples written since the last analyzed window (the windows overlap)
+            "audio_new": 0,
+            # Reused JPEG decode target, sized on the first frame (one frame in flight per interview)
+            "decode_buf": None
         }
+        self.interview_states[interview_id]["db_task"] = asyncio.create_task(
+            self._flush_loop(interview_id, self.interview_states[interview_id])
+        )
+        self.interview_states[interview_id]["video_task"] = asyncio.create_task(
+            self._video_worker(interview_id, self.interview_states[interview_id])
+        )
+        self.interview_states[interview_id]["send_task"] = asyncio.create_task(
+            self._send_loop(interview_id, self.interview_states[interview_id])
+        )
         
         # Start audio recording
         if self.interview_states[interview_id]["audio_recorder"].start_recording():
@@ -73,12 +277,19 @@ class ConnectionManager:
             logger.error(f"[Interview {interview_id}] Failed to start audio recording")
         logger.info(f"WebSocket connected for interview {interview_id}")
     
-    def disconnect(self, interview_id: int, db=None):
+    async def disconnect(self, interview_id: int, db=None):
         if interview_id in self.active_connections:
             del self.active_connections[interview_id]
         
         if interview_id in self.interview_states:
-            state = self.interview_states[interview_id]
+            state = self.interview_states.pop(interview_id)
+            
+            # Let the video worker finish its current frame and exit
+            state["closing"] = True
+            state["pending_event"].set()
+            await state["video_task"]
+            # Socket is gone, anything still queued cannot be delivered
+            state["send_task"].cancel()
             
             # Stop audio recording and save file
             audio_path = None
@@ -90,7 +301,6 @@ class ConnectionManager:
                     # Save audio path to database immediately
                     if db:
                         try:
-                            from ..models.interview import Interview, EmotionLog
                             interview = db.query(Interview).filter(Interview.id == interview_id).first()
                             if interview:
                                 interview.audio_file_path = audio_path
@@ -100,149 +310,172 @@ class ConnectionManager:
                         except Exception as e:
                             logger.error(f"[Interview {interview_id}] Failed to save audio path to DB: {e}")
             
-            # Save all collected emotions to database
-            if db and "emotions" in state and len(state["emotions"]) > 0:
-                try:
-                    from ..models.interview import EmotionLog
-                    logger.info(f"[Interview {interview_id}] Attempting to save {len(state['emotions'])} emotion records...")
-                    
-                    # Save emotions with good confidence
-                    saved_count = 0
-                    for emotion_data in state["emotions"]:
-                        facial_conf = float(emotion_data.get("facial_confidence", 0))
-                        
-                        # Only save if facial confidence > 0.5 (good quality)
-                        if facial_conf > 0.5:
-                            try:
-                                # Convert emotion_scores numpy types to native Python types for JSON serialization
-                                emotion_scores = emotion_data.get("emotion_scores")
-                                if emotion_scores and isinstance(emotion_scores, dict):
-                                    # Convert all numpy.float32 to Python float
-                                    emotion_scores = {
-                                        k: float(v) if hasattr(v, 'item') else v 
-                                        for k, v in emotion_scores.items()
-                                    }
-                                
-                                emotion_log = EmotionLog(
-                                    interview_id=interview_id,
-                                    timestamp=float(emotion_data.get("timestamp")),
-                                    facial_emotion=str(emotion_data.get("facial_emotion")),
-                                    facial_confidence=facial_conf,
-                                    speech_emotion=emotion_data.get("speech_emotion"),
-                                    speech_confidence=float(emotion_data.get("speech_confidence")) if emotion_data.get("speech_confidence") else None,
-                                    emotion_scores=emotion_scores
-                                )
-                                db.add(emotion_log)
-                                saved_count += 1
-                            except Exception as inner_e:
-                                logger.error(f"[Interview {interview_id}] Error adding emotion log: {inner_e}")
-                                continue
-                    
-                    if saved_count > 0:
-                        db.commit()
-                        logger.info(f"[Interview {interview_id}] ✅ SUCCESS! {saved_count} high-confidence emotion logs saved to database")
-                    else:
-                        logger.warning(f"[Interview {interview_id}] No emotions met confidence threshold (>0.5)")
-                        
-                except Exception as e:
-                    logger.error(f"[Interview {interview_id}] ❌ FAILED to save emotion logs: {e}")
-                    logger.exception(e)  # Full traceback
-                    db.rollback()
+            # Queue the last (still mergeable) emotion window and drain the DB writer
+            if state["emotions"]:
+                self._enqueue_emotion(interview_id, state, state["emotions"][-1])
+            await state["db_queue"].put(_FLUSH_SENTINEL)
+            await state["db_task"]
+            
+            if state["emotions_saved"] > 0:
+                logger.info(f"[Interview {interview_id}] ✅ SUCCESS! {state['emotions_saved']} high-confidence emotion logs saved to database")
+            elif state["emotion_count"] > 0:
+                logger.warning(f"[Interview {interview_id}] No emotions met confidence threshold (>0.5)")
             else:
-                if db:
-                    logger.warning(f"[Interview {interview_id}] No emotions to save (collected: {len(state.get('emotions', []))})")
-                else:
-                    logger.error(f"[Interview {interview_id}] Cannot save emotions - no database session")
+                logger.warning(f"[Interview {interview_id}] No emotions to save (collected: 0)")
             
-            # Cleanup services
+            # Return the facial service to the pool (models stay loaded for the next interview)
             if "facial_service" in state:
-                state["facial_service"].cleanup()
-            
-            del self.interview_states[interview_id]
+                _release_facial_service(state["facial_service"])
         
         logger.info(f"WebSocket disconnected for interview {interview_id}")
     
+    def _append_emotion(self, interview_id: int, state: Dict, emotion_data: Dict):
+        """Start a new emotion window; the previous one can no longer be merged, so queue it for the DB"""
+        if state["emotions"]:
+            self._enqueue_emotion(interview_id, state, state["emotions"][-1])
+        state["emotions"].append(emotion_data)
+        state["emotion_count"] += 1
+    
+    def _enqueue_emotion(self, interview_id: int, state: Dict, emotion_data: Dict):
+        row = _emotion_row(interview_id, emotion_data)
+        if row is None:
+            return
+        try:
+            state["db_queue"].put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning(f"[Interview {interview_id}] DB queue full - dropping emotion log")
+    
+    async def _flush_loop(self, interview_id: int, state: Dict):
+        """Drain the emotion queue, bulk-inserting every DB_FLUSH_BATCH_SIZE rows or DB_FLUSH_INTERVAL seconds"""
+        loop = asyncio.get_running_loop()
+        queue = state["db_queue"]
+        rows: List[Dict] = []
+        deadline = loop.time() + DB_FLUSH_INTERVAL
+        done = False
+        while not done:
+            try:
+                row = await asyncio.wait_for(queue.get(), timeout=max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                row = None
+            
+            if row is _FLUSH_SENTINEL:
+                done = True
+            elif row is not None:
+                rows.append(row)
+            
+            if rows and (done or len(rows) >= DB_FLUSH_BATCH_SIZE or loop.time() >= deadline):
+                try:
+                    await asyncio.to_thread(_write_emotion_rows, rows)
+                    state["emotions_saved"] += len(rows)
+                except Exception as e:
+                    logger.error(f"[Interview {interview_id}] ❌ FAILED to save emotion logs: {e}", exc_info=True)
+                rows = []
+            if loop.time() >= deadline:
+                deadline = loop.time() + DB_FLUSH_INTERVAL
+    
     async def send_message(self, interview_id: int, message: dict):
-        if interview_id in self.active_connections:
+        """Queue a message; _send_loop coalesces everything queued in one loop tick into one frame"""
+        state = self.interview_states.get(interview_id)
+        if state is None:
+            return
+        try:
+            state["send_queue"].put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"[Interview {interview_id}] Send queue full - dropping {message.get('type')} message")
+    
+    async def _send_loop(self, interview_id: int, state: Dict):
+        queue = state["send_queue"]
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            websocket = self.active_connections.get(interview_id)
+            if websocket is None:
+                continue
+            # A lone message keeps its own shape; several go out as one "batch" frame
+            payload = batch[0] if len(batch) == 1 else {"type": "batch", "items": batch}
             try:
-                # Convert numpy types to native Python types for JSON serialization
-                def convert_to_native(obj):
-                    if hasattr(obj, 'item'):  # numpy scalar
-                        return obj.item()
-                    elif isinstance(obj, dict):
-                        return {k: convert_to_native(v) for k, v in obj.items()}
-                    elif isinstance(obj, (list, tuple)):
-                        return [convert_to_native(item) for item in obj]
-                    elif hasattr(obj, 'tolist'):  # numpy array
-                        return obj.tolist()
-                    return obj
-                
-                clean_message = convert_to_native(message)
-                await self.active_connections[interview_id].send_json(clean_message)
+                # orjson serializes numpy scalars/arrays natively, no recursive conversion needed
+                await websocket.send_bytes(orjson.dumps(payload, option=ORJSON_OPTIONS))
             except Exception as e:
                 logger.error(f"Error sending message: {e}", exc_info=True)
     
     async def process_video_frame(self, interview_id: int, frame_data: str):
-        if interview_id not in self.interview_states:
+        state = self.interview_states.get(interview_id)
+        if state is None:
             logger.warning(f"[Video] Interview {interview_id} not in states")
             return
         
-        if not CV_AVAILABLE:
-            logger.debug("[Video] OpenCV not available - skipping")
-            return
-        
-        state = self.interview_states[interview_id]
+        # Cheapest gate first: most frames are skipped by the sampling rate
         state["frame_count"] += 1
-        
-        if state["frame_count"] % settings.VIDEO_FRAME_RATE != 0:
+        if state["frame_count"] % state["frame_rate"] or not VIDEO_ENABLED:
             return
         
-        logger.info(f"[Video] Processing frame {state['frame_count']} for interview {interview_id}")
+        # Latest wins: overwrite any frame the worker has not picked up yet
+        state["pending_frame"] = frame_data
+        state["pending_event"].set()
+    
+    async def _video_worker(self, interview_id: int, state: Dict):
+        """Per-interview task that analyzes the most recent pending frame, skipping stale ones"""
+        event = state["pending_event"]
+        while True:
+            await event.wait()
+            event.clear()
+            if state["closing"]:
+                return
+            frame_data, state["pending_frame"] = state["pending_frame"], None
+            if frame_data is not None:
+                await self._process_frame(interview_id, state, frame_data)
+    
+    async def _process_frame(self, interview_id: int, state: Dict, frame_data: str):
+        # isEnabledFor guards skip building the f-strings when INFO is suppressed
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[Video] Processing frame {state['frame_count']} for interview {interview_id}")
         
         try:
-            frame_bytes = base64.b64decode(frame_data.split(',')[1] if ',' in frame_data else frame_data)
-            nparr = np.frombuffer(frame_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            emotion_result = await asyncio.get_running_loop().run_in_executor(
+                self._frame_executor, _decode_and_detect, frame_data, state["facial_service"], state
+            )
             
-            if frame is None:
+            if emotion_result is None:
                 logger.error("[Video] Failed to decode frame")
                 return
             
-            emotion_result = state["facial_service"].detect_emotion(frame)
-            
-            logger.info(f"[Video] Emotion detected: {emotion_result.get('dominant_emotion')} (confidence: {emotion_result.get('confidence'):.2f}, face: {emotion_result.get('face_detected')})")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[Video] Emotion detected: {emotion_result.get('dominant_emotion')} (confidence: {emotion_result.get('confidence'):.2f}, face: {emotion_result.get('face_detected')})")
             
             if emotion_result["face_detected"]:
                 emotion_data = {
-                    "timestamp": datetime.utcnow().timestamp(),
+                    "timestamp": _now(state),
                     "facial_emotion": emotion_result["dominant_emotion"],
                     "facial_confidence": float(emotion_result["confidence"]),
                     "emotion_scores": emotion_result["all_emotions"]
                 }
                 
-                # Store in memory
-                state["emotions"].append(emotion_data)
+                # Store in memory; the previous window is handed to the DB writer
+                self._append_emotion(interview_id, state, emotion_data)
                 
+                # Bounded int8 ring of label codes, oldest entry is evicted automatically
                 state["emotion_history"].append(emotion_result["dominant_emotion"])
-                if len(state["emotion_history"]) > 100:
-                    state["emotion_history"].pop(0)
                 
                 emotion_stability = state["facial_service"].calculate_emotion_stability(
                     state["emotion_history"]
                 )
                 
                 # Log every 10th detection for monitoring
-                if len(state["emotions"]) % 10 == 0:
-                    logger.info(f"[Interview {interview_id}] Total emotions collected: {len(state['emotions'])}")
+                if state["emotion_count"] % 10 == 0:
+                    logger.info(f"[Interview {interview_id}] Total emotions collected: {state['emotion_count']}")
                 
-                logger.info(f"[Video] Sending emotion update: {emotion_result['dominant_emotion']}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"[Video] Sending emotion update: {emotion_result['dominant_emotion']}")
                 
-                # Convert numpy types to native Python types
+                # numpy scalars are passed through as-is; send_message serializes them
                 emotion_data = {
-                    "emotion": str(emotion_result["dominant_emotion"]),
-                    "confidence": float(emotion_result["confidence"]),
-                    "stability": float(emotion_stability),
-                    "all_emotions": {k: float(v) for k, v in emotion_result["all_emotions"].items()}
+                    "emotion": emotion_result["dominant_emotion"],
+                    "confidence": emotion_result["confidence"],
+                    "stability": emotion_stability,
+                    "all_emotions": emotion_result["all_emotions"]
                 }
                 
                 await self.send_message(interview_id, {
@@ -277,25 +510,28 @@ class ConnectionManager:
             if len(audio_bytes) == 0:
                 return
             
-            # Convert to numpy array
-            audio_array = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+            # Recorder writes 16-bit PCM, so hand it the int16 view as-is (no float round trip)
+            audio_int16 = np.frombuffer(audio_bytes, dtype=np.int16)
             
             # Write directly to audio file
-            audio_recorder.write_chunk(audio_array)
+            audio_recorder.write_chunk(audio_int16)
+            
+            # Keep the recent window for speech emotion analysis
+            _write_audio_ring(state, audio_int16)
             
             # Track audio chunk count
             state["audio_chunk_count"] += 1
             
-            # Analyze speech emotion every 5 chunks (~1 second)
+            # Analyze speech emotion every 5 chunks (~1 second) over the buffered window
             if state["audio_chunk_count"] % 5 == 0:
-                await self._analyze_speech_emotion(interview_id, audio_bytes)
+                await self._analyze_speech_emotion(interview_id)
                 
         except Exception as e:
             logger.error(f"[Audio] Error writing audio chunk: {e}")
     
-    async def _analyze_speech_emotion(self, interview_id: int, audio_bytes: bytes):
+    async def _analyze_speech_emotion(self, interview_id: int):
         """
-        Analyze speech emotion characteristics from audio
+        Analyze speech emotion characteristics from the buffered audio window
         Detects: intonation, pitch, energy, speaking rate, calmness
         """
         if interview_id not in self.interview_states:
@@ -307,21 +543,33 @@ class ConnectionManager:
         if not speech_recognizer:
             return
         
+        if state["speech_busy"]:
+            return  # Previous window still being analyzed
+        
+        state["speech_busy"] = True
         try:
+            # Window buffer is only rewritten when no analysis is in flight
+            audio_window = _read_audio_window(state)
+            new_samples = state["audio_new"]
+            state["audio_new"] = 0
+            
             # Analyze speech characteristics
-            speech_result = speech_recognizer.analyze_audio_chunk(audio_bytes)
+            speech_result = await asyncio.get_running_loop().run_in_executor(
+                self._frame_executor, _analyze_speech, speech_recognizer, audio_window, new_samples
+            )
             
             if speech_result is None:
                 return  # Skip if analysis failed (e.g., too short, silent)
             
-            logger.info(f"[Speech] Emotion: {speech_result['speech_emotion']}, "
-                       f"Confidence: {speech_result['confidence']:.2f}, "
-                       f"Calmness: {speech_result['calmness']:.2f}, "
-                       f"Pitch: {speech_result['voice_features']['pitch_hz']:.1f}Hz")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[Speech] Emotion: {speech_result['speech_emotion']}, "
+                           f"Confidence: {speech_result['confidence']:.2f}, "
+                           f"Calmness: {speech_result['calmness']:.2f}, "
+                           f"Pitch: {speech_result['voice_features']['pitch_hz']:.1f}Hz")
             
             # Store speech emotion with timestamp
             emotion_data = {
-                "timestamp": datetime.utcnow().timestamp(),
+                "timestamp": _now(state),
                 "speech_emotion": speech_result["speech_emotion"],
                 "speech_confidence": float(speech_result["confidence"]),
                 "speech_arousal": float(speech_result["arousal"]),
@@ -333,25 +581,19 @@ class ConnectionManager:
             }
             
             # Merge with existing facial emotion if within 2 seconds
-            if "emotions" in state and len(state["emotions"]) > 0:
-                last_emotion = state["emotions"][-1]
-                time_diff = emotion_data["timestamp"] - last_emotion.get("timestamp", 0)
-                
-                if time_diff < 2.0:
-                    # Same time window, merge with facial emotion
-                    last_emotion.update(emotion_data)
-                    logger.info(f"[Speech] Merged with facial emotion")
-                else:
-                    # Different time, new entry
-                    state["emotions"].append(emotion_data)
+            last_emotion = state["emotions"][-1] if state["emotions"] else None
+            if last_emotion is not None and emotion_data["timestamp"] - last_emotion.get("timestamp", 0) < 2.0:
+                # Same time window, merge with facial emotion
+                last_emotion.update(emotion_data)
+                logger.info(f"[Speech] Merged with facial emotion")
             else:
-                # First emotion, initialize list
-                if "emotions" not in state:
-                    state["emotions"] = []
-                state["emotions"].append(emotion_data)
+                # Different time (or first emotion), new entry
+                self._append_emotion(interview_id, state, emotion_data)
                     
         except Exception as e:
             logger.error(f"[Speech] Error analyzing speech emotion: {e}")
+        finally:
+            state["speech_busy"] = False
     
     async def get_current_analysis(self, interview_id: int) -> Dict:
         """
@@ -375,7 +617,7 @@ class ConnectionManager:
         # Full analysis happens in batch processing after interview
         return {
             "emotion_stability": emotion_stability,
-            "total_emotions": len(state.get("emotions", [])),
+            "total_emotions": state["emotion_count"],
             "status": "recording"
         }
 
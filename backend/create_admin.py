@@ -10,10 +10,19 @@ from getpass import getpass
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from sqlalchemy.orm import Session
-from app.database import engine, get_db
-from app.models.user import User
-from app.utils.security import get_password_hash
+from datetime import datetime
+from sqlalchemy import text
+from app.core.database import engine
+from app.core.security import get_password_hash
+
+# Raw statements on one connection; no ORM session/identity map needed for a one-off insert
+USER_EXISTS_SQL = text(
+    "SELECT 1 FROM users WHERE username = :username OR email = :email LIMIT 1"
+)
+INSERT_ADMIN_SQL = text(
+    "INSERT INTO users (username, email, full_name, hashed_password, role, is_active, created_at, updated_at) "
+    "VALUES (:username, :email, :full_name, :hashed_password, 'admin', 1, :now, :now)"
+)
 
 def create_admin_user(
     username: str,
@@ -22,32 +31,26 @@ def create_admin_user(
     password: str
 ):
     """Create an admin user"""
-    db = next(get_db())
-    
     try:
-        # Check if user already exists
-        existing_user = db.query(User).filter(
-            (User.username == username) | (User.email == email)
-        ).first()
-        
-        if existing_user:
-            print(f"❌ User with username '{username}' or email '{email}' already exists!")
-            return False
-        
-        # Create user
-        hashed_password = get_password_hash(password)
-        user = User(
-            username=username,
-            email=email,
-            full_name=full_name,
-            hashed_password=hashed_password,
-            role="admin",
-            is_active=True
-        )
-        
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        # One connection, one transaction (committed on exit, rolled back on error)
+        with engine.begin() as conn:
+            # Check if user already exists
+            existing_user = conn.execute(
+                USER_EXISTS_SQL, {"username": username, "email": email}
+            ).first()
+            
+            if existing_user:
+                print(f"❌ User with username '{username}' or email '{email}' already exists!")
+                return False
+            
+            # Create user
+            conn.execute(INSERT_ADMIN_SQL, {
+                "username": username,
+                "email": email,
+                "full_name": full_name,
+                "hashed_password": get_password_hash(password),
+                "now": datetime.utcnow()
+            })
         
         print(f"✅ Admin user created successfully!")
         print(f"   Username: {username}")
@@ -57,10 +60,7 @@ def create_admin_user(
         
     except Exception as e:
         print(f"❌ Error creating user: {e}")
-        db.rollback()
         return False
-    finally:
-        db.close()
 
 def main():
     print("=" * 50)
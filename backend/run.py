@@ -11,14 +11,32 @@ if venv_python.exists() and str(venv_python) != sys.executable:
 
 from app.core.config import settings
 
+# uvloop is not available on Windows; uvicorn falls back to the asyncio loop
+try:
+    import uvloop
+    uvloop.install()
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Worker processes (each has its own GIL, models and ConnectionManager). A websocket
+# stays on the worker that accepted it, so per-interview state never crosses processes.
+WORKERS = int(os.getenv("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+
 if __name__ == "__main__":
     print(f"Starting backend with Python: {sys.executable}")
     print(f"Debug mode: {settings.DEBUG}")
+    print(f"Workers: {WORKERS}")
     
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         reload=False,  # Disable reload to avoid Python path issues
-        log_level="info"
+        workers=WORKERS,
+        backlog=2048,
+        log_level="info",
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools",
+        ws="websockets"
     )
@@ -0,0 +1,51 @@
+"""
+Speaking-rate and labelling checks for the speech emotion recognizer.
+A 150 Hz tone amplitude-modulated at N Hz stands in for speech at N syllables/s.
+"""
+import numpy as np
+import pytest
+
+from app.services import speech_emotion_recognition as ser
+
+pytestmark = pytest.mark.skipif(not ser.AUDIO_LIBS_AVAILABLE, reason="scipy not installed")
+
+SAMPLE_RATE = 16000
+
+
+def _syllable_tone(syllables_per_second: float, seconds: float = 10.0, amplitude: float = 0.05) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * syllables_per_second * t)
+    return (amplitude * np.sin(2 * np.pi * 150.0 * t) * envelope).astype(np.float32)
+
+
+@pytest.mark.parametrize("syllables_per_second", [2, 4, 6, 8])
+def test_speaking_rate_matches_modulation_rate(syllables_per_second):
+    result = ser.SpeechEmotionRecognizer().analyze_full_clip(_syllable_tone(syllables_per_second), SAMPLE_RATE)
+
+    assert result['voice_features']['speaking_rate'] == pytest.approx(syllables_per_second * 60, rel=0.05)
+
+
+def test_baseline_speaking_rate_is_neutral():
+    result = ser.SpeechEmotionRecognizer().analyze_full_clip(_syllable_tone(4), SAMPLE_RATE)
+
+    assert result['speech_emotion'] == 'neutral'
+
+
+def test_baseline_speaking_rate_is_neutral_when_streamed():
+    recognizer = ser.SpeechEmotionRecognizer()
+    audio = _syllable_tone(4)
+    chunk = SAMPLE_RATE // 2
+    for start in range(0, len(audio), chunk):
+        result = recognizer.analyze_audio_chunk(audio[start:start + chunk])
+
+    assert result['speech_emotion'] == 'neutral'
+
+
+def test_overlapping_windows_count_each_frame_once():
+    recognizer = ser.SpeechEmotionRecognizer()
+    audio = _syllable_tone(4, seconds=30.0)
+    window, step = 2 * SAMPLE_RATE, SAMPLE_RATE
+    for end in range(window, len(audio) + 1, step):
+        result = recognizer.analyze_audio_chunk(audio[end - window:end], new_samples=step)
+
+    assert result['voice_features']['speaking_rate'] == pytest.approx(240, rel=0.05)
@@ -184,8 +184,8 @@ CREATE TABLE IF NOT EXISTS emotion_logs (
     speech_emotion VARCHAR(50),
     speech_confidence FLOAT,
     
-    -- Detailed emotion scores (JSON)
-    emotion_scores JSON,
+    -- Detailed emotion scores (orjson-encoded JSON bytes)
+    emotion_scores BLOB,
     
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
     
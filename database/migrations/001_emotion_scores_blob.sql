@@ -0,0 +1,9 @@
+-- ============================================================================
+-- emotion_logs.emotion_scores: JSON -> BLOB (orjson-encoded bytes)
+-- Existing rows keep their JSON text, which the backend still decodes.
+-- Usage: mysql -u root -p abis_interview < database/migrations/001_emotion_scores_blob.sql
+-- ============================================================================
+
+USE abis_interview;
+
+ALTER TABLE emotion_logs MODIFY emotion_scores BLOB NULL;
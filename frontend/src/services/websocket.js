@@ -7,6 +7,7 @@ class WebSocketService {
     this.listeners = new Map()
     this.reconnectAttempts = 0
     this.maxReconnectAttempts = 5
+    this.decoder = new TextDecoder()
   }
 
   connect(interviewId) {
@@ -15,6 +16,8 @@ class WebSocketService {
       const wsUrl = `${config.wsBaseUrl}/ws/interview/${interviewId}`
 
       this.ws = new WebSocket(wsUrl)
+      // Backend sends orjson-encoded JSON as binary frames
+      this.ws.binaryType = 'arraybuffer'
 
       this.ws.onopen = () => {
         console.log('WebSocket connected')
@@ -24,7 +27,8 @@ class WebSocketService {
 
       this.ws.onmessage = (event) => {
         try {
-          const message = JSON.parse(event.data)
+          const raw = typeof event.data === 'string' ? event.data : this.decoder.decode(event.data)
+          const message = JSON.parse(raw)
           this.handleMessage(message)
         } catch (error) {
           console.error('Error parsing message:', error)
@@ -44,6 +48,11 @@ class WebSocketService {
   }
 
   handleMessage(message) {
+    // Backend coalesces messages queued in the same tick into one batch frame
+    if (message.type === 'batch') {
+      message.items.forEach(item => this.handleMessage(item))
+      return
+    }
     const { type, data } = message
     const listeners = this.listeners.get(type) || []
     listeners.forEach(callback => callback(data))